@@ -7,7 +7,7 @@ from typing import Optional
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, scoped_transaction
 from app.models.macro_data import MacroData
 from app.models.sector_data import SectorData
 from app.models.scores import SectorScore, BusinessCycle
@@ -92,7 +92,8 @@ async def get_dashboard(db: Session = Depends(get_db)):
     if not rankings_data:
         # Calculate new scores
         scores = scorer.calculate_composite_scores(db=db)
-        scorer.save_scores(scores, db=db)
+        with scoped_transaction(db):
+            scorer.save_scores(scores, db=db)
         rankings_data = scorer.get_current_rankings(db=db)
 
     # Get prices and add to rankings
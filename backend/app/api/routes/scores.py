@@ -6,7 +6,7 @@ from typing import Optional, List
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, scoped_transaction
 from app.models.scores import SectorScore, BusinessCycle
 from app.services.ml.scorer import SectorScorer
 from app.services.data_collection.yahoo_collector import YahooCollector
@@ -36,7 +36,8 @@ async def get_sector_rankings(db: Session = Depends(get_db)):
     if not rankings:
         # Calculate new scores if none exist
         scores = scorer.calculate_composite_scores(db=db)
-        scorer.save_scores(scores, db=db)
+        with scoped_transaction(db):
+            scorer.save_scores(scores, db=db)
         rankings = scorer.get_current_rankings(db=db)
 
     # Add recommendations and price data
@@ -250,7 +251,8 @@ async def update_scores(
     Update sector scores for a specific date
     """
     scorer = SectorScorer()
-    scores = scorer.update_daily_scores(target_date)
+    with scoped_transaction(db):
+        scores = scorer.update_daily_scores(target_date, db=db)
 
     return {
         "status": "success",
@@ -1,7 +1,8 @@
 """
 Database setup and session management
 """
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pathlib import Path
@@ -14,10 +15,21 @@ DATABASE_URL = f"sqlite:///{data_dir}/sector_rotation.db"
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite specific
+    # SQLite specific; the timeout lets concurrent collectors wait out each other's writes
+    connect_args={"check_same_thread": False, "timeout": 30},
     echo=False,
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets the API read during writes; NORMAL skips the fsync per commit"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -32,6 +44,17 @@ def get_db():
         db.close()
 
 
+@contextmanager
+def scoped_transaction(db):
+    """Commit all writes made through the session once, or roll back on error"""
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
 def init_db():
     """Initialize database tables"""
     from app.models import macro_data, sector_data, scores, backtest_results
@@ -6,6 +6,7 @@ import os
 import logging
 from datetime import datetime, date
 from typing import Optional, Dict, List
+import numpy as np
 import pandas as pd
 
 try:
@@ -15,7 +16,7 @@ except ImportError:
     FRED_AVAILABLE = False
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from app.database import SessionLocal, engine
 from app.models.macro_data import MacroData
 from app.core.constants import FRED_SERIES
@@ -259,6 +260,113 @@ class FREDCollector:
             if close_session:
                 db.close()
 
+    def get_series_bulk(
+        self,
+        series_ids: List[str],
+        db: Optional[Session] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get values for several series from database in a single query
+
+        Args:
+            series_ids: FRED series IDs
+            db: Database session
+            limit: Only return the latest `limit` observations of each series
+
+        Returns:
+            Dict mapping series_id to its values in date order (NaN where missing);
+            series without data are omitted
+        """
+        close_session = False
+        if db is None:
+            db = SessionLocal()
+            close_session = True
+
+        try:
+            if limit is None:
+                stmt = text("""
+                    SELECT series_id, value
+                    FROM macro_data
+                    WHERE series_id IN :series_ids
+                    ORDER BY series_id, date
+                """).bindparams(bindparam("series_ids", expanding=True))
+                params = {"series_ids": list(series_ids)}
+            else:
+                # One LIMIT per series so each reads only its latest rows off the
+                # (series_id, date) index
+                latest = " UNION ALL ".join(
+                    f"SELECT * FROM (SELECT series_id, date, value FROM macro_data "
+                    f"WHERE series_id = :series_id_{i} ORDER BY date DESC LIMIT :limit)"
+                    for i in range(len(series_ids))
+                )
+                stmt = text(f"SELECT series_id, value FROM ({latest}) ORDER BY series_id, date")
+                params = {f"series_id_{i}": series_id for i, series_id in enumerate(series_ids)}
+                params["limit"] = limit
+
+            rows = db.execute(stmt, params).all() if series_ids else []
+
+            grouped: Dict[str, List[Optional[float]]] = {}
+            for series_id, value in rows:
+                grouped.setdefault(series_id, []).append(value)
+
+            return {
+                series_id: np.asarray(values, dtype=np.float64)
+                for series_id, values in grouped.items()
+            }
+
+        finally:
+            if close_session:
+                db.close()
+
+    def get_series_std(
+        self,
+        series_ids: List[str],
+        db: Optional[Session] = None,
+    ) -> Dict[str, float]:
+        """
+        Get the sample standard deviation of each series, computed in SQL
+
+        Args:
+            series_ids: FRED series IDs
+            db: Database session
+
+        Returns:
+            Dict mapping series_id to std over all non-null values
+            (NaN with fewer than two); series without data are omitted
+        """
+        close_session = False
+        if db is None:
+            db = SessionLocal()
+            close_session = True
+
+        try:
+            # Squared deviations from each series' mean, which does not cancel
+            # the way sum(x^2) - n * mean^2 does
+            stmt = text("""
+                SELECT d.series_id, COUNT(d.value),
+                       SUM((d.value - m.mean) * (d.value - m.mean))
+                FROM macro_data d
+                JOIN (
+                    SELECT series_id, AVG(value) AS mean
+                    FROM macro_data
+                    WHERE series_id IN :series_ids
+                    GROUP BY series_id
+                ) m ON d.series_id = m.series_id
+                GROUP BY d.series_id
+            """).bindparams(bindparam("series_ids", expanding=True))
+
+            rows = db.execute(stmt, {"series_ids": list(series_ids)}).all()
+
+            return {
+                series_id: float(np.sqrt(sum_sq / (count - 1))) if count > 1 else np.nan
+                for series_id, count, sum_sq in rows
+            }
+
+        finally:
+            if close_session:
+                db.close()
+
     def get_all_latest_values(self, db: Optional[Session] = None) -> Dict[str, Dict]:
         """
         Get latest values for all tracked series
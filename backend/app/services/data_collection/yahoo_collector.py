@@ -5,6 +5,7 @@ Fetches sector ETF price data
 import logging
 from datetime import datetime, date, timedelta
 from typing import Optional, Dict, List
+import numpy as np
 import pandas as pd
 
 try:
@@ -14,13 +15,16 @@ except ImportError:
     YFINANCE_AVAILABLE = False
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from app.database import SessionLocal
 from app.models.sector_data import SectorData
 from app.core.constants import SECTOR_ETFS, BENCHMARK_ETF, ALL_ETFS
 
 logger = logging.getLogger(__name__)
 
+# Rows per executemany batch when saving prices
+SAVE_CHUNK_SIZE = 1000
+
 
 class YahooCollector:
     """Collect sector ETF data from Yahoo Finance"""
@@ -59,34 +63,98 @@ class YahooCollector:
             df = ticker.history(start=start_date, end=end_date, auto_adjust=False)
 
             if df is not None and len(df) > 0:
-                df = df.reset_index()
-                df.columns = [c.lower().replace(" ", "_") for c in df.columns]
+                return self._standardize_prices(df, symbol)
 
-                # Standardize column names
-                df = df.rename(columns={
-                    "adj_close": "adj_close",
-                    "stock_splits": "splits",
-                })
+            logger.warning(f"No data returned for {symbol}")
+            return None
 
-                # Keep only needed columns
-                columns_to_keep = ["date", "open", "high", "low", "close", "volume"]
-                if "adj_close" in df.columns:
-                    columns_to_keep.append("adj_close")
+        except Exception as e:
+            logger.error(f"Error fetching Yahoo data for {symbol}: {str(e)}")
+            return None
 
-                df = df[[c for c in columns_to_keep if c in df.columns]]
+    def fetch_all_etf_data(
+        self,
+        symbols: List[str],
+        start_date: Optional[str] = "2004-01-01",
+        end_date: Optional[str] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch price data for several ETFs in one threaded batch download
 
-                # Convert date
-                df["date"] = pd.to_datetime(df["date"]).dt.date
-                df["symbol"] = symbol
+        Args:
+            symbols: ETF ticker symbols
+            start_date: Start date for data fetch
+            end_date: End date (defaults to today)
 
-                return df
+        Returns:
+            Dict mapping symbol to OHLCV DataFrame; symbols that failed are omitted
+        """
+        if not YFINANCE_AVAILABLE:
+            logger.error("yfinance not available")
+            return {}
 
-            logger.warning(f"No data returned for {symbol}")
-            return None
+        try:
+            if end_date is None:
+                end_date = datetime.now().strftime("%Y-%m-%d")
+
+            raw = yf.download(
+                symbols,
+                start=start_date,
+                end=end_date,
+                auto_adjust=False,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+            )
 
         except Exception as e:
-            logger.error(f"Error fetching Yahoo data for {symbol}: {str(e)}")
-            return None
+            logger.error(f"Error batch fetching Yahoo data: {str(e)}")
+            return {}
+
+        if raw is None or raw.empty:
+            return {}
+
+        results = {}
+        for symbol in symbols:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    continue
+                df = raw[symbol]
+            elif len(symbols) == 1:
+                df = raw
+            else:
+                continue
+
+            # Failed tickers come back as all-NaN columns
+            df = df.dropna(how="all")
+            if len(df) > 0:
+                results[symbol] = self._standardize_prices(df, symbol)
+
+        return results
+
+    def _standardize_prices(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Convert a yfinance price frame to date/OHLCV/adj_close/symbol columns"""
+        df = df.reset_index()
+        df.columns = [c.lower().replace(" ", "_") for c in df.columns]
+
+        # Standardize column names
+        df = df.rename(columns={
+            "adj_close": "adj_close",
+            "stock_splits": "splits",
+        })
+
+        # Keep only needed columns
+        columns_to_keep = ["date", "open", "high", "low", "close", "volume"]
+        if "adj_close" in df.columns:
+            columns_to_keep.append("adj_close")
+
+        df = df[[c for c in columns_to_keep if c in df.columns]]
+
+        # Convert date
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+        df["symbol"] = symbol
+
+        return df
 
     def save_to_db(self, df: pd.DataFrame, db: Optional[Session] = None) -> int:
         """
@@ -108,29 +176,28 @@ class YahooCollector:
             close_session = True
 
         try:
-            count = 0
-            for _, row in df.iterrows():
-                adj_close = row.get("adj_close", row["close"])
-
-                stmt = text("""
-                    INSERT OR REPLACE INTO sector_data
-                    (symbol, date, open, high, low, close, adj_close, volume, created_at)
-                    VALUES (:symbol, :date, :open, :high, :low, :close, :adj_close, :volume, CURRENT_TIMESTAMP)
-                """)
-                db.execute(
-                    stmt,
-                    {
-                        "symbol": row["symbol"],
-                        "date": row["date"],
-                        "open": float(row["open"]) if pd.notna(row["open"]) else None,
-                        "high": float(row["high"]) if pd.notna(row["high"]) else None,
-                        "low": float(row["low"]) if pd.notna(row["low"]) else None,
-                        "close": float(row["close"]) if pd.notna(row["close"]) else None,
-                        "adj_close": float(adj_close) if pd.notna(adj_close) else None,
-                        "volume": int(row["volume"]) if pd.notna(row["volume"]) else None,
-                    },
-                )
-                count += 1
+            stmt = text("""
+                INSERT OR REPLACE INTO sector_data
+                (symbol, date, open, high, low, close, adj_close, volume, created_at)
+                VALUES (:symbol, :date, :open, :high, :low, :close, :adj_close, :volume, CURRENT_TIMESTAMP)
+            """)
+
+            # Build every row's parameters column-wise, NaN -> None
+            params = pd.DataFrame({
+                "symbol": df["symbol"],
+                "date": df["date"],
+                "open": df["open"].astype(float),
+                "high": df["high"].astype(float),
+                "low": df["low"].astype(float),
+                "close": df["close"].astype(float),
+                "adj_close": df["adj_close" if "adj_close" in df.columns else "close"].astype(float),
+                "volume": np.trunc(df["volume"].astype(float)).astype("Int64"),
+            }).astype(object)
+            rows = params.where(params.notna(), None).to_dict("records")
+
+            for start in range(0, len(rows), SAVE_CHUNK_SIZE):
+                db.execute(stmt, rows[start:start + SAVE_CHUNK_SIZE])
+            count = len(rows)
 
             db.commit()
             logger.info(f"Saved {count} records for {df['symbol'].iloc[0]}")
@@ -188,10 +255,17 @@ class YahooCollector:
         db = SessionLocal()
 
         try:
+            # One threaded download for all tickers; retry any misses one by one
+            logger.info(f"Downloading {len(ALL_ETFS)} ETFs...")
+            fetched = self.fetch_all_etf_data(ALL_ETFS, start_date=start_date)
+
             for symbol in ALL_ETFS:
                 name = SECTOR_ETFS.get(symbol, {}).get("name", symbol)
                 logger.info(f"Updating {symbol} ({name})...")
-                count = self.update_etf(symbol, start_date=start_date, db=db)
+                if symbol in fetched:
+                    count = self.save_to_db(fetched[symbol], db)
+                else:
+                    count = self.update_etf(symbol, start_date=start_date, db=db)
                 results[symbol] = count
 
         finally:
@@ -275,6 +349,69 @@ class YahooCollector:
             if close_session:
                 db.close()
 
+    def get_all_etf_data(
+        self,
+        symbols: Optional[List[str]] = None,
+        lookback_days: int = 250,
+        db: Optional[Session] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get recent ETF data for several symbols in a single query
+
+        Args:
+            symbols: ETF ticker symbols (defaults to all ETFs)
+            lookback_days: Number of most recent trading days per symbol
+            db: Database session
+
+        Returns:
+            Dict mapping symbol to DataFrame with OHLCV data (oldest first);
+            symbols without data are omitted
+        """
+        if symbols is None:
+            symbols = ALL_ETFS
+
+        close_session = False
+        if db is None:
+            db = SessionLocal()
+            close_session = True
+
+        try:
+            # Last N bars per symbol, independent of how current the stored data is
+            stmt = text("""
+                SELECT symbol, date, open, high, low, close, adj_close, volume
+                FROM (
+                    SELECT symbol, date, open, high, low, close, adj_close, volume,
+                           ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS rn
+                    FROM sector_data
+                    WHERE symbol IN :symbols
+                )
+                WHERE rn <= :lookback_days
+                ORDER BY symbol, date
+            """).bindparams(bindparam("symbols", expanding=True))
+
+            rows = db.execute(stmt, {
+                "symbols": list(symbols),
+                "lookback_days": lookback_days,
+            }).all()
+
+            if not rows:
+                return {}
+
+            df = pd.DataFrame(
+                rows,
+                columns=["symbol", "date", "open", "high", "low", "close", "adj_close", "volume"],
+            )
+            df["date"] = pd.to_datetime(df["date"]).dt.date
+
+            return {
+                symbol: group.drop(columns="symbol").reset_index(drop=True)
+                for symbol, group in df.groupby("symbol", sort=False)
+            }
+
+        finally:
+            if close_session:
+                db.close()
+
     def get_all_etf_prices(
         self,
         target_date: Optional[date] = None,
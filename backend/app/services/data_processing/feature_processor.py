@@ -9,7 +9,7 @@ from typing import Optional, Dict, List, Tuple
 import logging
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 
 from app.database import SessionLocal
 from app.models.macro_data import MacroData
@@ -23,6 +23,17 @@ from app.core.constants import FRED_SERIES, SECTOR_ETFS, BENCHMARK_ETF, ALL_ETFS
 
 logger = logging.getLogger(__name__)
 
+# Per-series suffixes of the features get_macro_features produces
+# (current status plus MacroDataNormalizer.normalize_macros defaults)
+MACRO_FEATURE_SUFFIXES = (
+    "value", "percentile", "zscore",
+    "roc_1m", "roc_3m", "roc_6m", "roc_12m", "acceleration",
+    "vs_ma_3m", "vs_ma_6m", "vs_ma_12m",
+)
+
+# Saved with the macro features of a date to mark them as computed
+MACRO_FEATURES_MARKER = "_macro_features_saved"
+
 
 class FeatureProcessor:
     """Process and prepare features for ML model"""
@@ -32,10 +43,56 @@ class FeatureProcessor:
         self.yahoo_collector = YahooCollector()
         self.normalizer = MacroDataNormalizer()
 
+    def _get_macro_series(
+        self,
+        series_id: str,
+        target_date: Optional[date],
+        db: Session,
+        series_cache: Optional[Dict[str, pd.Series]] = None,
+    ) -> Optional[pd.Series]:
+        """
+        Load a macro series as floats indexed by date, up to target_date
+
+        With a series_cache, the full series is queried once and stored there,
+        and later calls (any target_date) slice the cached copy.
+        """
+        if series_cache is not None:
+            if series_id not in series_cache:
+                series_cache[series_id] = self._query_macro_series(series_id, None, db)
+            series = series_cache[series_id]
+            if target_date and len(series) > 0:
+                series = series[series.index <= target_date]
+        else:
+            series = self._query_macro_series(series_id, target_date, db)
+
+        return series if len(series) > 0 else None
+
+    def _query_macro_series(
+        self,
+        series_id: str,
+        target_date: Optional[date],
+        db: Session,
+    ) -> pd.Series:
+        """Query a macro series from the database, up to target_date"""
+        query = db.query(MacroData).filter(MacroData.series_id == series_id)
+
+        if target_date:
+            query = query.filter(MacroData.date <= target_date)
+
+        query = query.order_by(MacroData.date)
+        results = query.all()
+
+        return pd.Series(
+            [r.value for r in results],
+            index=[r.date for r in results],
+            dtype=float,
+        )
+
     def get_macro_features(
         self,
         target_date: Optional[date] = None,
         db: Optional[Session] = None,
+        series_cache: Optional[Dict[str, pd.Series]] = None,
     ) -> Dict[str, float]:
         """
         Get all macro features for a specific date
@@ -43,6 +100,8 @@ class FeatureProcessor:
         Args:
             target_date: Date to get features for (defaults to latest)
             db: Database session
+            series_cache: Optional dict of full series by ID, filled and reused
+                across calls to avoid re-querying the same series
 
         Returns:
             Dict of feature name to value
@@ -54,26 +113,37 @@ class FeatureProcessor:
 
         try:
             features = {}
+            all_series = {}
 
             for series_id, info in FRED_SERIES.items():
-                # Get series data
-                query = db.query(MacroData).filter(MacroData.series_id == series_id)
-
-                if target_date:
-                    query = query.filter(MacroData.date <= target_date)
-
-                query = query.order_by(MacroData.date)
-                results = query.all()
-
-                if not results:
-                    continue
-
-                # Convert to pandas Series
-                series = pd.Series(
-                    [r.value for r in results],
-                    index=[r.date for r in results]
-                )
+                series = self._get_macro_series(series_id, target_date, db, series_cache)
+                if series is not None:
+                    all_series[series_id] = series
+
+            # Normalize series that share the same dates in one batch; a cheap
+            # (length, first, last) key finds candidates and equals() confirms
+            groups: Dict[Tuple, List[List[str]]] = {}
+            for series_id, series in all_series.items():
+                index = series.index
+                candidates = groups.setdefault((len(index), index[0], index[-1]), [])
+                for group in candidates:
+                    if all_series[group[0]].index.equals(index):
+                        group.append(series_id)
+                        break
+                else:
+                    candidates.append([series_id])
+
+            latest_normalized: Dict[str, Dict[str, float]] = {}
+            for series_ids in (group for candidates in groups.values() for group in candidates):
+                df_macros = pd.DataFrame({sid: all_series[sid] for sid in series_ids})
+                metrics = self.normalizer.normalize_macros(df_macros, lookback=10 * 252)
+
+                for series_id in series_ids:
+                    latest_normalized[series_id] = {
+                        name: frame[series_id].iloc[-1] for name, frame in metrics.items()
+                    }
 
+            for series_id, series in all_series.items():
                 # Get current status
                 status = self.normalizer.get_current_status(series, series_id)
 
@@ -84,13 +154,8 @@ class FeatureProcessor:
                 features[f"{series_id}_roc_1m"] = status["roc_1m"]
 
                 # Add more detailed features
-                normalized = self.normalizer.normalize_macro_variable(
-                    series, series_id, lookback_years=10
-                )
-
-                for key, val_series in normalized.items():
-                    if not val_series.empty:
-                        features[key] = val_series.iloc[-1] if pd.notna(val_series.iloc[-1]) else None
+                for name, value in latest_normalized[series_id].items():
+                    features[f"{series_id}_{name}"] = value if pd.notna(value) else None
 
             return features
 
@@ -98,6 +163,59 @@ class FeatureProcessor:
             if close_session:
                 db.close()
 
+    def get_saved_macro_features(
+        self,
+        target_date: date,
+        db: Session,
+    ) -> Dict[str, float]:
+        """
+        Get macro features saved by process_daily_features for a date
+
+        Args:
+            target_date: Date the features were saved for
+            db: Database session
+
+        Returns:
+            Dict of feature name to value (None for features that were NaN
+            and so not saved); empty unless process_daily_features saved
+            the macro features for the date
+        """
+        marker = db.execute(
+            text("SELECT 1 FROM features WHERE date = :date AND feature_name = :name"),
+            {"date": target_date, "name": MACRO_FEATURES_MARKER},
+        ).first()
+        if marker is None:
+            return {}
+
+        # Every series with data by target_date contributes a full set of features
+        series_ids = db.execute(
+            text("""
+                SELECT series_id FROM macro_data
+                GROUP BY series_id
+                HAVING MIN(date) <= :date
+            """),
+            {"date": target_date},
+        ).scalars().all()
+
+        names = [
+            f"{series_id}_{suffix}"
+            for series_id in series_ids
+            if series_id in FRED_SERIES
+            for suffix in MACRO_FEATURE_SUFFIXES
+        ]
+        if not names:
+            return {}
+
+        stmt = text("""
+            SELECT feature_name, value
+            FROM features
+            WHERE date = :date AND feature_name IN :names
+        """).bindparams(bindparam("names", expanding=True))
+
+        saved = dict(db.execute(stmt, {"date": target_date, "names": names}).all())
+
+        return {name: saved.get(name) for name in names}
+
     def get_sector_features(
         self,
         symbol: str,
@@ -236,6 +354,8 @@ class FeatureProcessor:
         self,
         target_date: Optional[date] = None,
         db: Optional[Session] = None,
+        series_cache: Optional[Dict[str, pd.Series]] = None,
+        use_saved_macro: bool = False,
     ) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
         """
         Get all features for all sectors on a specific date
@@ -243,6 +363,9 @@ class FeatureProcessor:
         Args:
             target_date: Date to get features for
             db: Database session
+            series_cache: Optional shared macro series cache (see get_macro_features)
+            use_saved_macro: Read macro features saved for target_date when
+                present instead of recomputing them
 
         Returns:
             Tuple of (macro_features, sector_features_by_symbol)
@@ -254,7 +377,11 @@ class FeatureProcessor:
 
         try:
             # Get macro features (same for all sectors)
-            macro_features = self.get_macro_features(target_date, db)
+            macro_features = {}
+            if use_saved_macro and target_date:
+                macro_features = self.get_saved_macro_features(target_date, db)
+            if not macro_features:
+                macro_features = self.get_macro_features(target_date, db, series_cache)
 
             # Get sector-specific features
             sector_features = {}
@@ -313,6 +440,9 @@ class FeatureProcessor:
             all_features = []
             all_targets = []
 
+            # Each macro series is queried once and sliced per sample date
+            series_cache: Dict[str, pd.Series] = {}
+
             logger.info(f"Processing {len(sample_dates)} sample dates...")
 
             for i, target_date in enumerate(sample_dates):
@@ -321,7 +451,7 @@ class FeatureProcessor:
 
                 # Get features
                 macro_features, sector_features = self.get_all_features_for_date(
-                    target_date, db
+                    target_date, db, series_cache
                 )
 
                 # Get forward returns for targets
@@ -412,17 +542,18 @@ class FeatureProcessor:
             close_session = True
 
         try:
-            for name, value in features.items():
-                if value is not None and not np.isnan(value):
-                    stmt = text("""
-                        INSERT OR REPLACE INTO features (date, feature_name, value, created_at)
-                        VALUES (:date, :feature_name, :value, CURRENT_TIMESTAMP)
-                    """)
-                    db.execute(stmt, {
-                        "date": target_date,
-                        "feature_name": name,
-                        "value": float(value),
-                    })
+            rows = [
+                {"date": target_date, "feature_name": name, "value": float(value)}
+                for name, value in features.items()
+                if value is not None and not np.isnan(value)
+            ]
+
+            if rows:
+                stmt = text("""
+                    INSERT OR REPLACE INTO features (date, feature_name, value, created_at)
+                    VALUES (:date, :feature_name, :value, CURRENT_TIMESTAMP)
+                """)
+                db.execute(stmt, rows)
 
             db.commit()
             logger.info(f"Saved {len(features)} features for {target_date}")
@@ -455,8 +586,10 @@ class FeatureProcessor:
                 target_date, db
             )
 
-            # Save macro features
-            self.save_features_to_db(macro_features, target_date, db)
+            # Save macro features, marked as computed in the same commit
+            self.save_features_to_db(
+                {**macro_features, MACRO_FEATURES_MARKER: 1.0}, target_date, db
+            )
 
             # Save sector features
             for symbol, features in sector_features.items():
@@ -4,12 +4,246 @@ Calculate moving averages, momentum, RSI, and other technical indicators
 """
 import numpy as np
 import pandas as pd
-from typing import Optional, List, Dict
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional, List, Dict, Tuple
+import warnings
+
+
+# Columns added by TechnicalIndicators.calculate_all_indicators, in order
+INDICATOR_COLUMNS = [
+    "sma_20", "ema_20", "sma_50", "ema_50", "sma_200", "ema_200",
+    "price_vs_sma_20", "price_vs_sma_50", "price_vs_sma_200",
+    "rsi_14",
+    "momentum_5", "momentum_10", "momentum_20",
+    "roc_5", "roc_20", "roc_60",
+    "macd", "macd_signal", "macd_histogram",
+    "bb_upper", "bb_middle", "bb_lower", "bb_width", "bb_position",
+    "atr_14",
+    "percentile_1y", "percentile_5y",
+    "zscore_1y",
+    "trend",
+]
 
 
 class TechnicalIndicators:
     """Calculate technical indicators for time series data"""
 
+    # -------------------------------------------------------------------------
+    # ndarray implementations
+    #
+    # Each public indicator is a thin pd.Series wrapper around one of these.
+    # calculate_all_indicators calls them directly so that no intermediate
+    # Series (and no index alignment on assignment) is created per column.
+    # -------------------------------------------------------------------------
+
+    # Windows longer than this use the O(N) cumulative-sum difference
+    # instead of summing each window (O(N * window))
+    CUMSUM_WINDOW_THRESHOLD = 64
+
+    @staticmethod
+    def _window_sum(x: np.ndarray, window: int) -> np.ndarray:
+        """Trailing window sums along axis 0, with a partial window at the start"""
+        if window > TechnicalIndicators.CUMSUM_WINDOW_THRESHOLD:
+            csum = np.cumsum(x, axis=0)
+            sums = csum.copy()
+            sums[window:] -= csum[:-window]
+            return sums
+
+        head = np.cumsum(x[:window], axis=0)
+        if len(x) <= window:
+            return head
+        tail = sliding_window_view(x[1:], window, axis=0).sum(axis=-1)
+        return np.concatenate((head, tail))
+
+    @staticmethod
+    def _rolling_mean_impl(x: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+        """NaN-aware rolling mean (matches pandas rolling().mean())"""
+        out = np.full(len(x), np.nan)
+        if len(x) == 0:
+            return out
+
+        valid = ~np.isnan(x)
+        sums = TechnicalIndicators._window_sum(np.where(valid, x, 0.0), window)
+        counts = TechnicalIndicators._window_sum(valid.astype(np.float64), window)
+
+        np.divide(sums, counts, out=out, where=counts >= min_periods)
+        return out
+
+    @staticmethod
+    def _rolling_mean_std_impl(
+        x: np.ndarray,
+        window: int,
+        min_periods: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        NaN-aware rolling mean and sample std along axis 0 (1D or column-wise 2D)
+
+        Window sums are taken on data centered by each column's mean, so the
+        sum-of-squares difference does not cancel on high-level, low-volatility
+        series. NaN handling and min_periods match pandas rolling().mean() / .std().
+        """
+        mean = np.full(x.shape, np.nan)
+        std = np.full(x.shape, np.nan)
+        if len(x) == 0:
+            return mean, std
+
+        valid = ~np.isnan(x)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            center = np.nan_to_num(np.nanmean(x, axis=0))
+        filled = np.where(valid, x - center, 0.0)
+
+        sums = TechnicalIndicators._window_sum(filled, window)
+        sumsq = TechnicalIndicators._window_sum(filled * filled, window)
+        counts = TechnicalIndicators._window_sum(valid.astype(np.float64), window)
+
+        np.divide(sums, counts, out=mean, where=counts >= min_periods)
+        mean += center
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = (sumsq - sums * sums / counts) / (counts - 1)
+        np.sqrt(np.maximum(var, 0.0), out=std, where=counts >= max(min_periods, 2))
+
+        return mean, std
+
+    @staticmethod
+    def _rolling_std_impl(x: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+        """NaN-aware rolling sample std (matches pandas rolling().std())"""
+        return TechnicalIndicators._rolling_mean_std_impl(x, window, min_periods)[1]
+
+    @staticmethod
+    def _shift_impl(x: np.ndarray, period: int) -> np.ndarray:
+        """Shift values forward by period, filling the head with NaN"""
+        out = np.full(len(x), np.nan)
+        if period < len(x):
+            out[period:] = x[:len(x) - period]
+        return out
+
+    @staticmethod
+    def _sma_impl(x: np.ndarray, period: int) -> np.ndarray:
+        return TechnicalIndicators._rolling_mean_impl(x, period, 1)
+
+    @staticmethod
+    def _ema_impl(x: np.ndarray, period: int) -> np.ndarray:
+        return pd.Series(x).ewm(span=period, adjust=False).mean().to_numpy()
+
+    @staticmethod
+    def _rsi_impl(x: np.ndarray, period: int = 14) -> np.ndarray:
+        delta = x - TechnicalIndicators._shift_impl(x, 1)
+
+        # Branchless split; fmax (unlike maximum) maps a NaN delta to 0
+        gain = np.fmax(delta, 0.0)
+        loss = np.fmax(-delta, 0.0)
+
+        avg_gain = TechnicalIndicators._rolling_mean_impl(gain, period, 1)
+        avg_loss = TechnicalIndicators._rolling_mean_impl(loss, period, 1)
+
+        rsi = np.full(len(x), 50.0)
+        mask = avg_loss != 0
+        rsi[mask] = 100 - (100 / (1 + avg_gain[mask] / avg_loss[mask]))
+        return rsi
+
+    @staticmethod
+    def _momentum_impl(x: np.ndarray, period: int = 12) -> np.ndarray:
+        return x - TechnicalIndicators._shift_impl(x, period)
+
+    @staticmethod
+    def _rate_of_change_impl(x: np.ndarray, period: int) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (x / TechnicalIndicators._shift_impl(x, period) - 1) * 100
+
+    @staticmethod
+    def _macd_impl(
+        x: np.ndarray,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+    ) -> Dict[str, np.ndarray]:
+        fast_ema = TechnicalIndicators._ema_impl(x, fast_period)
+        slow_ema = TechnicalIndicators._ema_impl(x, slow_period)
+
+        macd_line = fast_ema - slow_ema
+        signal_line = TechnicalIndicators._ema_impl(macd_line, signal_period)
+
+        return {
+            "macd": macd_line,
+            "signal": signal_line,
+            "histogram": macd_line - signal_line,
+        }
+
+    @staticmethod
+    def _bollinger_bands_impl(
+        x: np.ndarray,
+        period: int = 20,
+        std_dev: float = 2.0,
+    ) -> Dict[str, np.ndarray]:
+        middle = TechnicalIndicators._sma_impl(x, period)
+        rolling_std = TechnicalIndicators._rolling_std_impl(x, period, 1)
+
+        return {
+            "middle": middle,
+            "upper": middle + (rolling_std * std_dev),
+            "lower": middle - (rolling_std * std_dev),
+        }
+
+    @staticmethod
+    def _atr_impl(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        period: int = 14,
+    ) -> np.ndarray:
+        prev_close = TechnicalIndicators._shift_impl(close, 1)
+
+        # fmax skips NaN like DataFrame.max(axis=1)
+        true_range = np.fmax(
+            np.fmax(high - low, np.abs(high - prev_close)),
+            np.abs(low - prev_close),
+        )
+
+        return TechnicalIndicators._rolling_mean_impl(true_range, period, 1)
+
+    @staticmethod
+    def _historical_percentile_impl(x: np.ndarray, lookback: int = 2520) -> np.ndarray:
+        n = len(x)
+        out = np.full(n, np.nan)
+        if n == 0:
+            return out
+
+        padded = np.concatenate((np.full(lookback - 1, np.nan), x))
+        windows = sliding_window_view(padded, lookback)
+
+        # NaN compares False, so padding never counts as "below"
+        below = (windows[:, -1:] > windows[:, :-1]).sum(axis=1)
+        lengths = np.minimum(np.arange(1, n + 1), lookback)
+        counts = TechnicalIndicators._window_sum((~np.isnan(x)).astype(np.float64), lookback)
+
+        np.divide(below * 100.0, lengths - 1, out=out, where=counts >= 20)
+        return out
+
+    @staticmethod
+    def _zscore_impl(x: np.ndarray, lookback: int = 252) -> np.ndarray:
+        rolling_mean = TechnicalIndicators._rolling_mean_impl(x, lookback, 20)
+        rolling_std = TechnicalIndicators._rolling_std_impl(x, lookback, 20)
+        rolling_std[rolling_std == 0] = np.nan
+
+        return (x - rolling_mean) / rolling_std
+
+    @staticmethod
+    def _trend_direction_impl(
+        x: np.ndarray,
+        short_period: int = 20,
+        long_period: int = 50,
+    ) -> np.ndarray:
+        short_ma = TechnicalIndicators._sma_impl(x, short_period)
+        long_ma = TechnicalIndicators._sma_impl(x, long_period)
+
+        return (short_ma > long_ma).astype(np.int64) - (short_ma < long_ma).astype(np.int64)
+
+    # -------------------------------------------------------------------------
+    # Public Series API
+    # -------------------------------------------------------------------------
+
     @staticmethod
     def sma(series: pd.Series, period: int) -> pd.Series:
         """
@@ -22,7 +256,8 @@ class TechnicalIndicators:
         Returns:
             SMA series
         """
-        return series.rolling(window=period, min_periods=1).mean()
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(TechnicalIndicators._sma_impl(x, period), index=series.index, name=series.name)
 
     @staticmethod
     def ema(series: pd.Series, period: int) -> pd.Series:
@@ -36,7 +271,8 @@ class TechnicalIndicators:
         Returns:
             EMA series
         """
-        return series.ewm(span=period, adjust=False).mean()
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(TechnicalIndicators._ema_impl(x, period), index=series.index, name=series.name)
 
     @staticmethod
     def rsi(series: pd.Series, period: int = 14) -> pd.Series:
@@ -50,18 +286,8 @@ class TechnicalIndicators:
         Returns:
             RSI series (0-100)
         """
-        delta = series.diff()
-
-        gain = delta.where(delta > 0, 0)
-        loss = (-delta).where(delta < 0, 0)
-
-        avg_gain = gain.rolling(window=period, min_periods=1).mean()
-        avg_loss = loss.rolling(window=period, min_periods=1).mean()
-
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi.fillna(50)
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(TechnicalIndicators._rsi_impl(x, period), index=series.index, name=series.name)
 
     @staticmethod
     def momentum(series: pd.Series, period: int = 12) -> pd.Series:
@@ -75,7 +301,8 @@ class TechnicalIndicators:
         Returns:
             Momentum series
         """
-        return series.diff(period)
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(TechnicalIndicators._momentum_impl(x, period), index=series.index, name=series.name)
 
     @staticmethod
     def rate_of_change(series: pd.Series, period: int) -> pd.Series:
@@ -89,7 +316,8 @@ class TechnicalIndicators:
         Returns:
             ROC series (percentage)
         """
-        return series.pct_change(periods=period) * 100
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(TechnicalIndicators._rate_of_change_impl(x, period), index=series.index, name=series.name)
 
     @staticmethod
     def macd(
@@ -110,18 +338,10 @@ class TechnicalIndicators:
         Returns:
             Dict with 'macd', 'signal', 'histogram' series
         """
-        fast_ema = TechnicalIndicators.ema(series, fast_period)
-        slow_ema = TechnicalIndicators.ema(series, slow_period)
-
-        macd_line = fast_ema - slow_ema
-        signal_line = TechnicalIndicators.ema(macd_line, signal_period)
-        histogram = macd_line - signal_line
+        x = series.to_numpy(dtype=np.float64)
+        macd = TechnicalIndicators._macd_impl(x, fast_period, slow_period, signal_period)
 
-        return {
-            "macd": macd_line,
-            "signal": signal_line,
-            "histogram": histogram,
-        }
+        return {key: pd.Series(arr, index=series.index) for key, arr in macd.items()}
 
     @staticmethod
     def bollinger_bands(
@@ -140,17 +360,10 @@ class TechnicalIndicators:
         Returns:
             Dict with 'middle', 'upper', 'lower' bands
         """
-        middle = TechnicalIndicators.sma(series, period)
-        rolling_std = series.rolling(window=period, min_periods=1).std()
-
-        upper = middle + (rolling_std * std_dev)
-        lower = middle - (rolling_std * std_dev)
+        x = series.to_numpy(dtype=np.float64)
+        bb = TechnicalIndicators._bollinger_bands_impl(x, period, std_dev)
 
-        return {
-            "middle": middle,
-            "upper": upper,
-            "lower": lower,
-        }
+        return {key: pd.Series(arr, index=series.index) for key, arr in bb.items()}
 
     @staticmethod
     def atr(
@@ -171,15 +384,13 @@ class TechnicalIndicators:
         Returns:
             ATR series
         """
-        prev_close = close.shift(1)
-
-        tr1 = high - low
-        tr2 = abs(high - prev_close)
-        tr3 = abs(low - prev_close)
-
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-
-        return true_range.rolling(window=period, min_periods=1).mean()
+        atr = TechnicalIndicators._atr_impl(
+            high.to_numpy(dtype=np.float64),
+            low.to_numpy(dtype=np.float64),
+            close.to_numpy(dtype=np.float64),
+            period,
+        )
+        return pd.Series(atr, index=close.index)
 
     @staticmethod
     def historical_percentile(series: pd.Series, lookback: int = 2520) -> pd.Series:
@@ -193,13 +404,11 @@ class TechnicalIndicators:
         Returns:
             Percentile series (0-100)
         """
-        def calc_percentile(window):
-            if len(window) < 2:
-                return 50
-            return (window.iloc[-1] > window.iloc[:-1]).sum() / (len(window) - 1) * 100
-
-        return series.rolling(window=lookback, min_periods=20).apply(
-            calc_percentile, raw=False
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(
+            TechnicalIndicators._historical_percentile_impl(x, lookback),
+            index=series.index,
+            name=series.name,
         )
 
     @staticmethod
@@ -214,10 +423,8 @@ class TechnicalIndicators:
         Returns:
             Z-score series
         """
-        rolling_mean = series.rolling(window=lookback, min_periods=20).mean()
-        rolling_std = series.rolling(window=lookback, min_periods=20).std()
-
-        return (series - rolling_mean) / rolling_std.replace(0, np.nan)
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(TechnicalIndicators._zscore_impl(x, lookback), index=series.index, name=series.name)
 
     @staticmethod
     def trend_direction(series: pd.Series, short_period: int = 20, long_period: int = 50) -> pd.Series:
@@ -232,14 +439,11 @@ class TechnicalIndicators:
         Returns:
             Series with values: 1 (uptrend), -1 (downtrend), 0 (neutral)
         """
-        short_ma = TechnicalIndicators.sma(series, short_period)
-        long_ma = TechnicalIndicators.sma(series, long_period)
-
-        trend = pd.Series(index=series.index, data=0)
-        trend[short_ma > long_ma] = 1
-        trend[short_ma < long_ma] = -1
-
-        return trend
+        x = series.to_numpy(dtype=np.float64)
+        return pd.Series(
+            TechnicalIndicators._trend_direction_impl(x, short_period, long_period),
+            index=series.index,
+        )
 
     @staticmethod
     def calculate_all_indicators(
@@ -256,57 +460,71 @@ class TechnicalIndicators:
         Returns:
             DataFrame with added indicator columns
         """
-        result = df.copy()
-        price = df[price_col]
+        has_ohlc = all(col in df.columns for col in ["high", "low", "close"])
+        columns = [c for c in INDICATOR_COLUMNS if c != "atr_14" or has_ohlc]
+        col = {name: i for i, name in enumerate(columns)}
+
+        # All indicators are written into one pre-allocated block and turned
+        # into a DataFrame once, instead of growing the frame column by column
+        out = np.empty((len(df), len(columns)))
+        price = df[price_col].to_numpy(dtype=np.float64)
 
         # Moving Averages
         for period in [20, 50, 200]:
-            result[f"sma_{period}"] = TechnicalIndicators.sma(price, period)
-            result[f"ema_{period}"] = TechnicalIndicators.ema(price, period)
+            out[:, col[f"sma_{period}"]] = TechnicalIndicators._sma_impl(price, period)
+            out[:, col[f"ema_{period}"]] = TechnicalIndicators._ema_impl(price, period)
 
         # Price vs MAs
         for period in [20, 50, 200]:
-            result[f"price_vs_sma_{period}"] = price / result[f"sma_{period}"] - 1
+            out[:, col[f"price_vs_sma_{period}"]] = price / out[:, col[f"sma_{period}"]] - 1
 
         # RSI
-        result["rsi_14"] = TechnicalIndicators.rsi(price, 14)
+        out[:, col["rsi_14"]] = TechnicalIndicators._rsi_impl(price, 14)
 
         # Momentum
         for period in [5, 10, 20]:
-            result[f"momentum_{period}"] = TechnicalIndicators.momentum(price, period)
+            out[:, col[f"momentum_{period}"]] = TechnicalIndicators._momentum_impl(price, period)
 
         # Rate of Change
         for period in [5, 20, 60]:
-            result[f"roc_{period}"] = TechnicalIndicators.rate_of_change(price, period)
+            out[:, col[f"roc_{period}"]] = TechnicalIndicators._rate_of_change_impl(price, period)
 
         # MACD
-        macd = TechnicalIndicators.macd(price)
-        result["macd"] = macd["macd"]
-        result["macd_signal"] = macd["signal"]
-        result["macd_histogram"] = macd["histogram"]
+        macd = TechnicalIndicators._macd_impl(price)
+        out[:, col["macd"]] = macd["macd"]
+        out[:, col["macd_signal"]] = macd["signal"]
+        out[:, col["macd_histogram"]] = macd["histogram"]
 
         # Bollinger Bands
-        bb = TechnicalIndicators.bollinger_bands(price)
-        result["bb_upper"] = bb["upper"]
-        result["bb_middle"] = bb["middle"]
-        result["bb_lower"] = bb["lower"]
-        result["bb_width"] = (bb["upper"] - bb["lower"]) / bb["middle"]
-        result["bb_position"] = (price - bb["lower"]) / (bb["upper"] - bb["lower"])
+        bb = TechnicalIndicators._bollinger_bands_impl(price)
+        band_range = bb["upper"] - bb["lower"]
+        out[:, col["bb_upper"]] = bb["upper"]
+        out[:, col["bb_middle"]] = bb["middle"]
+        out[:, col["bb_lower"]] = bb["lower"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:, col["bb_width"]] = band_range / bb["middle"]
+            out[:, col["bb_position"]] = (price - bb["lower"]) / band_range
 
         # ATR (if OHLC data available)
-        if all(col in df.columns for col in ["high", "low", "close"]):
-            result["atr_14"] = TechnicalIndicators.atr(
-                df["high"], df["low"], df["close"], 14
+        if has_ohlc:
+            out[:, col["atr_14"]] = TechnicalIndicators._atr_impl(
+                df["high"].to_numpy(dtype=np.float64),
+                df["low"].to_numpy(dtype=np.float64),
+                df["close"].to_numpy(dtype=np.float64),
+                14,
             )
 
         # Historical Percentile
-        result["percentile_1y"] = TechnicalIndicators.historical_percentile(price, 252)
-        result["percentile_5y"] = TechnicalIndicators.historical_percentile(price, 252 * 5)
+        out[:, col["percentile_1y"]] = TechnicalIndicators._historical_percentile_impl(price, 252)
+        out[:, col["percentile_5y"]] = TechnicalIndicators._historical_percentile_impl(price, 252 * 5)
 
         # Z-Score
-        result["zscore_1y"] = TechnicalIndicators.zscore(price, 252)
+        out[:, col["zscore_1y"]] = TechnicalIndicators._zscore_impl(price, 252)
 
         # Trend Direction
-        result["trend"] = TechnicalIndicators.trend_direction(price)
+        out[:, col["trend"]] = TechnicalIndicators._trend_direction_impl(price)
 
-        return result
+        indicators_df = pd.DataFrame(out, columns=columns, index=df.index)
+        # The trend direction is an integer signal (1, 0, -1), as trend_direction returns
+        indicators_df["trend"] = indicators_df["trend"].astype(np.int64)
+        return pd.concat([df.drop(columns=columns, errors="ignore"), indicators_df], axis=1)
@@ -4,10 +4,113 @@ Normalize and standardize macro economic data
 """
 import numpy as np
 import pandas as pd
-from typing import Optional, Dict, Tuple
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from typing import Optional, Dict, Tuple, Any
 import pickle
+import warnings
 from pathlib import Path
+from numba import njit, prange
+
+from app.services.data_processing.indicators import TechnicalIndicators
+
+
+@njit(cache=True)
+def _rolling_minmax(x: np.ndarray, window: int, min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling min and max in a single O(N) pass
+
+    Keeps two monotonic deques of indices (ring buffers of size window):
+    the front of each is the current window's min/max. NaNs are skipped
+    and do not count toward min_periods, matching pandas rolling().min().
+
+    Args:
+        x: Input values
+        window: Window size
+        min_periods: Minimum non-NaN observations required
+
+    Returns:
+        Tuple of (rolling_min, rolling_max) arrays
+    """
+    n = x.shape[0]
+    lo = np.full(n, np.nan)
+    hi = np.full(n, np.nan)
+    lo_dq = np.empty(window, np.int64)
+    hi_dq = np.empty(window, np.int64)
+    lo_h = lo_t = hi_h = hi_t = 0
+    count = 0
+
+    for i in range(n):
+        start = i - window + 1
+
+        # Expire the observation leaving the window
+        if start > 0 and not np.isnan(x[start - 1]):
+            count -= 1
+        while lo_t > lo_h and lo_dq[lo_h % window] < start:
+            lo_h += 1
+        while hi_t > hi_h and hi_dq[hi_h % window] < start:
+            hi_h += 1
+
+        v = x[i]
+        if not np.isnan(v):
+            count += 1
+            while lo_t > lo_h and x[lo_dq[(lo_t - 1) % window]] >= v:
+                lo_t -= 1
+            lo_dq[lo_t % window] = i
+            lo_t += 1
+            while hi_t > hi_h and x[hi_dq[(hi_t - 1) % window]] <= v:
+                hi_t -= 1
+            hi_dq[hi_t % window] = i
+            hi_t += 1
+
+        if count >= min_periods:
+            lo[i] = x[lo_dq[lo_h % window]]
+            hi[i] = x[hi_dq[hi_h % window]]
+
+    return lo, hi
+
+
+@njit(parallel=True, cache=True)
+def _rolling_percentile(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    Rolling historical percentile for every column of a (T, V) matrix
+
+    Percent of the prior observations in the window that the current value
+    exceeds, matching the rolling-apply percentile used elsewhere in this
+    module. Columns are processed in parallel.
+
+    Args:
+        values: (T, V) matrix, one variable per column
+        window: Window size
+        min_periods: Minimum non-NaN observations required
+
+    Returns:
+        (T, V) percentile matrix (0-100)
+    """
+    n, m = values.shape
+    out = np.full((n, m), np.nan)
+
+    for j in prange(m):
+        count = 0
+        for i in range(n):
+            if not np.isnan(values[i, j]):
+                count += 1
+            if i >= window and not np.isnan(values[i - window, j]):
+                count -= 1
+            if count < min_periods:
+                continue
+
+            start = max(0, i - window + 1)
+            if i == start:
+                out[i, j] = 50.0
+                continue
+
+            current = values[i, j]
+            below = 0
+            for k in range(start, i):
+                if current > values[k, j]:
+                    below += 1
+            out[i, j] = below * 100.0 / (i - start)
+
+    return out
 
 
 class DataNormalizer:
@@ -21,7 +124,8 @@ class DataNormalizer:
             method: Normalization method ('zscore', 'minmax', 'percentile')
         """
         self.method = method
-        self.scalers: Dict[str, StandardScaler | MinMaxScaler] = {}
+        # Fitted sklearn scalers or (shift, scale) pairs by name
+        self.scalers: Dict[str, Any] = {}
 
     def fit_transform(
         self,
@@ -45,11 +149,64 @@ class DataNormalizer:
         else:
             return self._full_normalize(series, name)
 
+    def fit_transform_batch(
+        self,
+        df: pd.DataFrame,
+        name_prefix: str = "",
+    ) -> pd.DataFrame:
+        """
+        Fit and transform all columns of a DataFrame in one vectorized pass
+
+        The (shift, scale) pair for each column is stored under
+        name_prefix + column, so transform() works per series afterwards.
+
+        Args:
+            df: DataFrame with one variable per column
+            name_prefix: Prefix for the stored scaler names
+
+        Returns:
+            Normalized DataFrame (same index and columns)
+        """
+        values = df.to_numpy(dtype=np.float64)
+
+        with warnings.catch_warnings():
+            # All-NaN columns yield NaN statistics, which is what we want
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            if self.method == "zscore":
+                shift = np.nanmean(values, axis=0)
+                scale = np.nanstd(values, axis=0)
+            elif self.method == "minmax":
+                shift = np.nanmin(values, axis=0)
+                scale = np.nanmax(values, axis=0) - shift
+            else:
+                raise ValueError(f"Unknown method: {self.method}")
+
+        # Constant columns are left unscaled, as sklearn does
+        scale[scale == 0] = 1.0
+
+        for col, col_shift, col_scale in zip(df.columns, shift, scale):
+            self.scalers[f"{name_prefix}{col}"] = (float(col_shift), float(col_scale))
+
+        return pd.DataFrame((values - shift) / scale, index=df.index, columns=df.columns)
+
+    @staticmethod
+    def _apply_scaler(scaler, values: np.ndarray, inverse: bool = False) -> np.ndarray:
+        """Apply a fitted sklearn scaler or a (shift, scale) pair to a column vector"""
+        if isinstance(scaler, tuple):
+            shift, scale = scaler
+            return values * scale + shift if inverse else (values - shift) / scale
+
+        if inverse:
+            return scaler.inverse_transform(values)
+        return scaler.transform(values)
+
     def _full_normalize(self, series: pd.Series, name: str) -> pd.Series:
         """Normalize using full series statistics"""
         values = series.values.reshape(-1, 1)
         valid_mask = ~np.isnan(values.flatten())
 
+        from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
         if self.method == "zscore":
             scaler = StandardScaler()
         elif self.method == "minmax":
@@ -73,10 +230,11 @@ class DataNormalizer:
             return (series - rolling_mean) / rolling_std.replace(0, np.nan)
 
         elif self.method == "minmax":
-            rolling_min = series.rolling(window=lookback, min_periods=20).min()
-            rolling_max = series.rolling(window=lookback, min_periods=20).max()
+            values = series.to_numpy(dtype=np.float64)
+            rolling_min, rolling_max = _rolling_minmax(values, lookback, 20)
             range_val = rolling_max - rolling_min
-            return (series - rolling_min) / range_val.replace(0, np.nan)
+            range_val[range_val == 0] = np.nan
+            return pd.Series((values - rolling_min) / range_val, index=series.index)
 
         elif self.method == "percentile":
             def calc_percentile(window):
@@ -110,7 +268,7 @@ class DataNormalizer:
         valid_mask = ~np.isnan(values.flatten())
 
         result = np.full(len(series), np.nan)
-        result[valid_mask] = scaler.transform(values[valid_mask].reshape(-1, 1)).flatten()
+        result[valid_mask] = self._apply_scaler(scaler, values[valid_mask].reshape(-1, 1)).flatten()
 
         return pd.Series(result, index=series.index)
 
@@ -133,7 +291,9 @@ class DataNormalizer:
         valid_mask = ~np.isnan(values.flatten())
 
         result = np.full(len(series), np.nan)
-        result[valid_mask] = scaler.inverse_transform(values[valid_mask].reshape(-1, 1)).flatten()
+        result[valid_mask] = self._apply_scaler(
+            scaler, values[valid_mask].reshape(-1, 1), inverse=True
+        ).flatten()
 
         return pd.Series(result, index=series.index)
 
@@ -204,6 +364,75 @@ class MacroDataNormalizer:
     def __init__(self):
         self.normalizer = DataNormalizer(method="percentile")
 
+    def normalize_macros(
+        self,
+        df_macros: pd.DataFrame,
+        lookback: int,
+        roc_months: Tuple[int, ...] = (1, 3, 6, 12),
+        ma_months: Tuple[int, ...] = (3, 6, 12),
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Calculate derived metrics for many macro variables at once
+
+        All variables are stacked into one (T, V) float matrix and every
+        rolling statistic is computed column-wise on that shared buffer.
+        Variables must share the same index (e.g. the same release dates).
+
+        Args:
+            df_macros: DataFrame with one macro variable per column
+            lookback: Window (observations) for z-score and percentile
+            roc_months: Months for rate-of-change columns
+            ma_months: Months for moving-average comparisons
+
+        Returns:
+            Dict mapping metric name ('value', 'zscore', 'percentile',
+            'roc_1m', ..., 'acceleration', 'vs_ma_3m', ...) to a DataFrame
+            with the same index and columns as df_macros
+        """
+        values = df_macros.to_numpy(dtype=np.float64)
+        metrics = {"value": values}
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Z-score (rolling)
+            rolling_mean, rolling_std = TechnicalIndicators._rolling_mean_std_impl(
+                values, lookback, 20
+            )
+            metrics["zscore"] = (values - rolling_mean) / rolling_std
+
+            # Historical percentile (rolling)
+            metrics["percentile"] = _rolling_percentile(
+                np.asfortranarray(values), lookback, 20
+            )
+
+            # Rate of change (various periods)
+            for months in roc_months:
+                periods = months * 21  # Approximate trading days per month
+                metrics[f"roc_{months}m"] = (values / self._shift(values, periods) - 1) * 100
+
+            # Momentum (acceleration)
+            roc_3m = metrics.get("roc_3m")
+            if roc_3m is None:
+                roc_3m = (values / self._shift(values, 63) - 1) * 100
+            metrics["acceleration"] = roc_3m - self._shift(roc_3m, 21)
+
+            # Trend vs moving averages
+            for months in ma_months:
+                ma, _ = TechnicalIndicators._rolling_mean_std_impl(values, months * 21, 10)
+                metrics[f"vs_ma_{months}m"] = (values / ma - 1) * 100
+
+        return {
+            name: pd.DataFrame(arr, index=df_macros.index, columns=df_macros.columns)
+            for name, arr in metrics.items()
+        }
+
+    @staticmethod
+    def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+        """Shift rows forward by periods, filling the head with NaN"""
+        shifted = np.full(values.shape, np.nan)
+        if periods < len(values):
+            shifted[periods:] = values[:len(values) - periods]
+        return shifted
+
     def normalize_macro_variable(
         self,
         series: pd.Series,
@@ -223,42 +452,12 @@ class MacroDataNormalizer:
         """
         lookback = lookback_years * 252  # Approximate trading days
 
-        result = {}
-
-        # Current value (raw)
-        result[f"{variable_name}_value"] = series
-
-        # Z-score (rolling)
-        rolling_mean = series.rolling(window=lookback, min_periods=20).mean()
-        rolling_std = series.rolling(window=lookback, min_periods=20).std()
-        result[f"{variable_name}_zscore"] = (series - rolling_mean) / rolling_std
-
-        # Historical percentile (rolling)
-        def calc_pct(window):
-            if len(window) < 2:
-                return 50
-            return (window.iloc[-1] > window.iloc[:-1]).sum() / (len(window) - 1) * 100
+        metrics = self.normalize_macros(series.to_frame(variable_name), lookback)
 
-        result[f"{variable_name}_percentile"] = series.rolling(
-            window=lookback, min_periods=20
-        ).apply(calc_pct, raw=False)
-
-        # Rate of change (various periods)
-        for months in [1, 3, 6, 12]:
-            periods = months * 21  # Approximate trading days per month
-            result[f"{variable_name}_roc_{months}m"] = series.pct_change(periods) * 100
-
-        # Momentum (acceleration)
-        roc_3m = result[f"{variable_name}_roc_3m"]
-        result[f"{variable_name}_acceleration"] = roc_3m.diff(21)
-
-        # Trend vs moving averages
-        for months in [3, 6, 12]:
-            ma_periods = months * 21
-            ma = series.rolling(window=ma_periods, min_periods=10).mean()
-            result[f"{variable_name}_vs_ma_{months}m"] = (series / ma - 1) * 100
-
-        return result
+        return {
+            f"{variable_name}_{name}": frame[variable_name]
+            for name, frame in metrics.items()
+        }
 
     def get_current_status(
         self,
@@ -5,31 +5,105 @@ Predicts relative sector performance based on macro factors
 import numpy as np
 import pandas as pd
 from datetime import date, datetime
-from typing import Optional, Dict, List, Tuple, Any
-import pickle
+from typing import Optional, Dict, List, Tuple, Any, Callable
+from importlib.util import find_spec
+from collections import OrderedDict
+from functools import lru_cache
+import copy
 import logging
+import math
+import os
+import tempfile
+import threading
 from pathlib import Path
 
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import Ridge
-from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import warnings
+from app.core.constants import SECTOR_ETFS
 
-warnings.filterwarnings("ignore")
+# numba, sklearn, XGBoost and cuML are imported where they are used, so that
+# processes which never train or score do not pay for loading them
+XGBOOST_AVAILABLE = find_spec("xgboost") is not None
+FIL_AVAILABLE = find_spec("cuml") is not None
+PYARROW_AVAILABLE = find_spec("pyarrow") is not None
 
-try:
-    from xgboost import XGBRegressor
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
+# GPU forest inference only pays off for larger batches
+FIL_MIN_ROWS = 64
 
-from app.core.constants import SECTOR_ETFS
+# Number of distinct sector-score inputs memoized per model
+SCORE_CACHE_SIZE = 1024
+
+# Features at or below this gradient boosting importance are dropped after training
+FEATURE_IMPORTANCE_MIN = 1e-4
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _sanitize_scale_kernel():
+    """Compile _sanitize_scale on first use"""
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def _sanitize_scale(
+        arr: np.ndarray,
+        mu: np.ndarray,
+        inv_scale: np.ndarray,
+        medians: np.ndarray,
+    ) -> None:
+        """
+        Fill NaNs with medians, zero infinities and standardize in one pass
+
+        Args:
+            arr: Feature matrix, modified in place
+            mu: Per-feature mean
+            inv_scale: Per-feature reciprocal standard deviation
+            medians: Per-feature fill values for NaNs
+        """
+        for i in prange(arr.shape[0]):
+            for j in range(arr.shape[1]):
+                v = arr[i, j]
+                if math.isnan(v):
+                    v = medians[j]
+                elif math.isinf(v):
+                    v = 0.0
+                arr[i, j] = (v - mu[j]) * inv_scale[j]
+
+    return _sanitize_scale
+
+
+@lru_cache(maxsize=None)
+def _detect_cuda() -> bool:
+    """Check once per process whether a CUDA device is available for XGBoost"""
+    try:
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def _write_atomically(filepath: Path, write: Callable[[str], None]):
+    """
+    Write a file through a temporary sibling and move it into place
+
+    Readers that memory-mapped the previous file keep its contents;
+    truncating it in place would fault their next read.
+
+    Args:
+        filepath: Destination file
+        write: Writes the contents to the path it is given
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=filepath.parent, prefix=f".{filepath.stem}.", suffix=filepath.suffix
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
 class SectorRotationModel:
     """
     Machine Learning model for predicting sector relative performance
@@ -39,6 +113,13 @@ class SectorRotationModel:
     - Ridge Regression (baseline)
     """
 
+    # Loaded model files shared by every instance:
+    # absolute path -> (mtime_ns, data, sector score cache)
+    _cache: Dict[str, Tuple[int, Dict[str, Any], "OrderedDict[bytes, Dict[str, float]]"]] = {}
+
+    # Guards score caches, which instances loaded from one file share across threads
+    _score_cache_lock = threading.Lock()
+
     def __init__(self, models_dir: Optional[Path] = None):
         """
         Initialize the sector rotation model
@@ -49,12 +130,26 @@ class SectorRotationModel:
         self.models_dir = models_dir or Path("data/models")
         self.models_dir.mkdir(parents=True, exist_ok=True)
 
-        self.scaler = StandardScaler()
+        # Created when the model is trained or loaded
+        self.scaler: Optional[Any] = None
         self.models: Dict[str, Any] = {}
         self.feature_names: List[str] = []
+        self._feature_name_to_idx: Dict[str, int] = {}
         self.feature_importance: Dict[str, Dict[str, float]] = {}
+        self._feature_medians: Optional[np.ndarray] = None
+        self._mu: Optional[np.ndarray] = None
+        self._inv_scale: Optional[np.ndarray] = None
         self.is_trained = False
 
+        # Train XGBoost on the GPU when one is present
+        self._has_cuda = XGBOOST_AVAILABLE and _detect_cuda()
+        self._booster = None
+        self._fil = None
+        self._fil_disabled = False
+        self._ridge_coef: Optional[np.ndarray] = None
+        self._ridge_intercept = np.float32(0.0)
+        self._score_cache: "OrderedDict[bytes, Dict[str, float]]" = OrderedDict()
+
         # Model parameters
         self.ensemble_weights = {"gradient_boosting": 0.7, "ridge": 0.3}
 
@@ -78,19 +173,50 @@ class SectorRotationModel:
         Returns:
             Scaled feature array
         """
-        feature_cols = self._get_feature_columns(features_df)
-        self.feature_names = feature_cols
+        if fit_scaler:
+            self.feature_names = self._get_feature_columns(features_df)
+            frame = features_df[self.feature_names]
+        else:
+            # Score exactly the trained columns; absent ones are filled with medians
+            frame = features_df.reindex(columns=self.feature_names)
+
+        # Single float32 copy; all cleaning below happens in place
+        X = frame.to_numpy(dtype=np.float32, copy=True)
 
-        X = features_df[feature_cols].copy()
+        if not fit_scaler and self._feature_medians is not None:
+            _sanitize_scale_kernel()(X, self._mu, self._inv_scale, self._feature_medians)
+            return X
 
-        # Handle missing values
-        X = X.fillna(X.median())
-        X = X.replace([np.inf, -np.inf], 0)
+        # Handle missing values with training-set medians
+        np.nan_to_num(X, copy=False, nan=np.nan, posinf=0.0, neginf=0.0)
+        if fit_scaler:
+            self._feature_medians = np.nanmedian(X, axis=0)
+        medians = self._feature_medians
+        if medians is None:
+            # Models saved before medians were stored
+            medians = np.nanmedian(X, axis=0)
+        np.copyto(X, medians, where=np.isnan(X))
 
         if fit_scaler:
-            return self.scaler.fit_transform(X)
+            from sklearn.preprocessing import StandardScaler
+
+            self.scaler = StandardScaler()
+            X = self.scaler.fit_transform(X)
+            self._freeze_scaler()
+            return X
         else:
-            return self.scaler.transform(X)
+            return self._scale(X)
+
+    def _freeze_scaler(self):
+        """Cache the fitted scaler parameters as float32 arrays"""
+        self._mu = self.scaler.mean_.astype(np.float32)
+        self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        """Standardize a float32 feature matrix in place"""
+        np.subtract(X, self._mu, out=X)
+        np.multiply(X, self._inv_scale, out=X)
+        return X
 
     def train(
         self,
@@ -109,20 +235,32 @@ class SectorRotationModel:
         Returns:
             Dict with training metrics
         """
+        from sklearn.linear_model import Ridge
+        from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+
         logger.info("Starting model training...")
 
-        # Merge features and targets
-        df = features_df.merge(
-            targets_df[["date", "symbol", "relative_return"]],
-            on=["date", "symbol"],
-        )
+        # Align targets to feature rows by (date, symbol) index lookup
+        targets_idx = targets_df.set_index(["date", "symbol"])["relative_return"]
+        duplicated = targets_idx.index.duplicated(keep="last")
+        if duplicated.any():
+            logger.warning(
+                f"Dropping {duplicated.sum()} duplicate (date, symbol) targets, keeping the last"
+            )
+            targets_idx = targets_idx[~duplicated]
+        keys = pd.MultiIndex.from_arrays([features_df["date"], features_df["symbol"]])
+        y = targets_idx.reindex(keys).to_numpy(dtype=np.float32)
+        has_target = ~np.isnan(y)
+        df = features_df[has_target]
+        y = y[has_target]
 
-        # Sort by date for time series split
-        df = df.sort_values("date")
+        # Sort by date for time series split, reordering only the arrays used below
+        order = np.argsort(df["date"].to_numpy(), kind="stable")
 
         # Prepare features and target
-        X = self._prepare_features(df, fit_scaler=True)
-        y = df["relative_return"].values
+        X = self._prepare_features(df, fit_scaler=True)[order]
+        y = y[order]
+        self._feature_name_to_idx = {name: i for i, name in enumerate(self.feature_names)}
 
         # Time series split
         split_idx = int(len(df) * (1 - validation_split))
@@ -135,9 +273,14 @@ class SectorRotationModel:
 
         # Train Gradient Boosting / XGBoost
         if XGBOOST_AVAILABLE:
-            logger.info("Training XGBoost model...")
+            from xgboost import XGBRegressor
+
+            device = "cuda" if self._has_cuda else "cpu"
+            logger.info(f"Training XGBoost model ({device})...")
             gb_model = XGBRegressor(
-                n_estimators=100,
+                n_estimators=500,
+                early_stopping_rounds=30,
+                eval_metric="rmse",
                 max_depth=5,
                 learning_rate=0.1,
                 subsample=0.8,
@@ -146,19 +289,61 @@ class SectorRotationModel:
                 reg_lambda=1.0,
                 random_state=42,
                 verbosity=0,
+                tree_method="hist",
+                max_bin=256,
+                n_jobs=-1,
+                device=device,
             )
+            if not self._has_cuda:
+                gb_model.set_params(grow_policy="lossguide")
+            fit_params = {"eval_set": [(X_val, y_val)], "verbose": False}
         else:
-            logger.info("Training Gradient Boosting model...")
-            gb_model = GradientBoostingRegressor(
-                n_estimators=100,
+            from sklearn.ensemble import HistGradientBoostingRegressor
+
+            logger.info("Training Histogram Gradient Boosting model...")
+            gb_model = HistGradientBoostingRegressor(
+                max_iter=100,
                 max_depth=5,
                 learning_rate=0.1,
-                subsample=0.8,
+                l2_regularization=1.0,
+                early_stopping=True,
+                validation_fraction=0.1,
                 random_state=42,
             )
+            fit_params = {}
+
+        try:
+            gb_model.fit(X_train, y_train, **fit_params)
+        except Exception as e:
+            if not self._has_cuda:
+                raise
+            logger.warning(f"XGBoost CUDA training failed, falling back to CPU: {str(e)}")
+            gb_model.set_params(device="cpu", grow_policy="lossguide")
+            gb_model.fit(X_train, y_train, **fit_params)
+
+        # Drop features the trees barely use, then refit on the remaining columns
+        importances = getattr(gb_model, "feature_importances_", None)
+        if importances is not None:
+            keep = np.flatnonzero(importances > FEATURE_IMPORTANCE_MIN)
+            if 0 < len(keep) < len(self.feature_names):
+                logger.info(
+                    f"Pruning {len(self.feature_names) - len(keep)} low-importance features"
+                )
+                kept_names = [self.feature_names[i] for i in keep]
+                X = self._prepare_features(df[kept_names], fit_scaler=True)[order]
+                X_train, X_val = X[:split_idx], X[split_idx:]
+                self._feature_name_to_idx = {name: i for i, name in enumerate(self.feature_names)}
+                if "eval_set" in fit_params:
+                    fit_params["eval_set"] = [(X_val, y_val)]
+                gb_model.fit(X_train, y_train, **fit_params)
+
+        if XGBOOST_AVAILABLE:
+            logger.info(f"XGBoost stopped after {gb_model.best_iteration + 1} rounds")
+            gb_model.set_params(n_estimators=gb_model.best_iteration + 1)
 
-        gb_model.fit(X_train, y_train)
         self.models["gradient_boosting"] = gb_model
+        self._set_booster(gb_model)
+        self._fil = None
 
         # Gradient Boosting metrics
         gb_train_pred = gb_model.predict(X_train)
@@ -183,7 +368,9 @@ class SectorRotationModel:
         logger.info("Training Ridge Regression model...")
         ridge_model = Ridge(alpha=1.0)
         ridge_model.fit(X_train, y_train)
+        ridge_model.coef_ = ridge_model.coef_.astype(np.float32, copy=False)
         self.models["ridge"] = ridge_model
+        self._set_ridge(ridge_model)
 
         # Ridge metrics
         ridge_train_pred = ridge_model.predict(X_train)
@@ -198,17 +385,21 @@ class SectorRotationModel:
         logger.info(f"Ridge Val R²: {metrics['ridge_val_r2']:.4f}")
 
         # Ensemble validation
-        ensemble_pred = (
-            self.ensemble_weights["gradient_boosting"] * gb_val_pred +
-            self.ensemble_weights["ridge"] * ridge_val_pred
+        V = np.column_stack([gb_val_pred, ridge_val_pred])
+        w = np.array(
+            [self.ensemble_weights["gradient_boosting"], self.ensemble_weights["ridge"]],
+            dtype=V.dtype,
         )
+        ensemble_pred = V @ w
 
         metrics["ensemble_val_rmse"] = np.sqrt(mean_squared_error(y_val, ensemble_pred))
         metrics["ensemble_val_r2"] = r2_score(y_val, ensemble_pred)
         metrics["ensemble_val_mae"] = mean_absolute_error(y_val, ensemble_pred)
 
-        # Calculate correlation
-        correlation = np.corrcoef(y_val, ensemble_pred)[0, 1]
+        # Pearson correlation from centered vectors (no 2x2 corrcoef matrix)
+        yz = y_val - y_val.mean()
+        pz = ensemble_pred - ensemble_pred.mean()
+        correlation = np.dot(yz, pz) / (np.linalg.norm(yz) * np.linalg.norm(pz) + 1e-12)
         metrics["ensemble_correlation"] = correlation
 
         logger.info(f"Ensemble Val RMSE: {metrics['ensemble_val_rmse']:.4f}")
@@ -216,7 +407,8 @@ class SectorRotationModel:
         logger.info(f"Ensemble Correlation: {metrics['ensemble_correlation']:.4f}")
 
         self.is_trained = True
-        return metrics
+        self._score_cache = OrderedDict()
+        return {name: float(value) for name, value in metrics.items()}
 
     def predict(
         self,
@@ -236,18 +428,76 @@ class SectorRotationModel:
 
         X = self._prepare_features(features_df, fit_scaler=False)
 
-        # Get predictions from each model
-        predictions = {}
-        for name, model in self.models.items():
-            predictions[name] = model.predict(X)
-
-        # Ensemble prediction
-        ensemble_pred = np.zeros(len(X))
-        for name, weight in self.ensemble_weights.items():
-            if name in predictions:
-                ensemble_pred += weight * predictions[name]
-
-        return ensemble_pred
+        return self._ensemble_predict(X)
+
+    def _ensemble_predict(self, X: np.ndarray) -> np.ndarray:
+        """Weighted ensemble of model predictions as a single matrix-vector product"""
+        names = [name for name in self.ensemble_weights if name in self.models]
+        P = np.column_stack([self._model_predict(name, X) for name in names])
+        w = np.array([self.ensemble_weights[name] for name in names], dtype=P.dtype)
+        return P @ w
+
+    def _model_predict(self, name: str, X: np.ndarray) -> np.ndarray:
+        """Predict with one ensemble member, using GPU FIL for large XGBoost batches"""
+        if (
+            name == "gradient_boosting"
+            and FIL_AVAILABLE
+            and self._has_cuda
+            and not self._fil_disabled
+            and len(X) >= FIL_MIN_ROWS
+        ):
+            try:
+                fil = self._get_fil()
+                return np.asarray(fil.predict(X.astype(np.float32))).reshape(-1)
+            except Exception as e:
+                logger.warning(f"FIL inference failed, using XGBoost predict: {str(e)}")
+                self._fil_disabled = True
+
+        if name == "ridge" and self._ridge_coef is not None:
+            return X @ self._ridge_coef + self._ridge_intercept
+
+        if name == "gradient_boosting" and self._booster is not None:
+            # Predict straight from the array without building a DMatrix
+            return self._booster.inplace_predict(X)
+
+        return self.models[name].predict(X)
+
+    def _set_booster(self, gb_model: Any):
+        """Cache the XGBoost booster, truncated to the early-stopping best iteration"""
+        if not hasattr(gb_model, "get_booster"):
+            self._booster = None
+            return
+
+        booster = gb_model.get_booster()
+        best_iteration = getattr(gb_model, "best_iteration", None)
+        if best_iteration is not None:
+            booster = booster[: best_iteration + 1]
+        self._booster = booster
+
+    def _set_ridge(self, ridge_model: Any):
+        """Cache Ridge coefficients so inference is a plain matrix-vector product"""
+        if ridge_model is None:
+            self._ridge_coef = None
+            return
+
+        self._ridge_coef = np.asarray(ridge_model.coef_, dtype=np.float32)
+        self._ridge_intercept = np.float32(ridge_model.intercept_)
+
+    def _get_fil(self):
+        """Lazily compile the XGBoost trees into a cuML Forest Inference model"""
+        if self._fil is None:
+            from cuml.fil import ForestInference
+
+            # Private copy of the trees, so concurrent models never share the file
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                model_path = Path(tmp_dir) / "gb_model.json"
+                self._booster.save_model(str(model_path))
+                self._fil = ForestInference.load(
+                    str(model_path),
+                    model_type="xgboost_json",
+                    output_class=False,
+                )
+        return self._fil
 
     def predict_sector_scores(
         self,
@@ -267,39 +517,48 @@ class SectorRotationModel:
         if not self.is_trained:
             raise ValueError("Model not trained. Call train() first.")
 
-        scores = {}
+        symbols = list(SECTOR_ETFS.keys())
 
-        for symbol in SECTOR_ETFS.keys():
-            # Combine features
-            combined_features = {**features_dict, **sector_features.get(symbol, {})}
+        try:
+            # One row per sector, scored in a single batch; unknown features are ignored
+            name_to_idx = self._feature_name_to_idx
+            X_raw = np.zeros((len(symbols), len(self.feature_names)), dtype=np.float32)
 
-            # Create single-row DataFrame
-            row_df = pd.DataFrame([combined_features])
+            for name, value in features_dict.items():
+                idx = name_to_idx.get(name)
+                if idx is not None and value is not None:
+                    X_raw[:, idx] = value
 
-            # Ensure all expected columns exist
-            for col in self.feature_names:
-                if col not in row_df.columns:
-                    row_df[col] = 0
+            for row, symbol in enumerate(symbols):
+                for name, value in sector_features.get(symbol, {}).items():
+                    idx = name_to_idx.get(name)
+                    if idx is not None:
+                        X_raw[row, idx] = 0.0 if value is None else value
 
-            # Select only expected columns in correct order
-            row_df = row_df[self.feature_names]
+            np.nan_to_num(X_raw, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
 
-            try:
-                X = self.scaler.transform(row_df.fillna(0).replace([np.inf, -np.inf], 0))
+            # Identical raw inputs give identical scores; the bytes themselves are the key
+            key = X_raw.tobytes()
+            with self._score_cache_lock:
+                cached = self._score_cache.get(key)
+                if cached is not None:
+                    self._score_cache.move_to_end(key)
+                    return dict(cached)
 
-                # Ensemble prediction
-                pred = 0
-                for name, model in self.models.items():
-                    weight = self.ensemble_weights.get(name, 0)
-                    pred += weight * model.predict(X)[0]
+            X = self._scale(X_raw)
+            ensemble = self._ensemble_predict(X)
+            scores = dict(zip(symbols, ensemble.astype(float).tolist()))
 
-                scores[symbol] = float(pred)
+            with self._score_cache_lock:
+                self._score_cache[key] = scores
+                if len(self._score_cache) > SCORE_CACHE_SIZE:
+                    self._score_cache.popitem(last=False)
 
-            except Exception as e:
-                logger.warning(f"Error predicting for {symbol}: {str(e)}")
-                scores[symbol] = 0.0
+            return dict(scores)
 
-        return scores
+        except Exception as e:
+            logger.warning(f"Error predicting sector scores: {str(e)}")
+            return {symbol: 0.0 for symbol in symbols}
 
     def save(self, filename: str = "sector_model"):
         """
@@ -310,18 +569,32 @@ class SectorRotationModel:
         """
         filepath = self.models_dir / f"{filename}.pkl"
 
+        # Store XGBoost in its native format so the file survives library upgrades
+        models = dict(self.models)
+        xgb_file = None
+        if hasattr(models.get("gradient_boosting"), "get_booster"):
+            xgb_file = f"{filename}_gb.json"
+            _write_atomically(self.models_dir / xgb_file, models["gradient_boosting"].save_model)
+            models["gradient_boosting"] = None
+
         model_data = {
-            "models": self.models,
+            "models": models,
+            "xgb_model_file": xgb_file,
             "scaler": self.scaler,
             "feature_names": self.feature_names,
             "feature_importance": self.feature_importance,
+            "feature_medians": self._feature_medians,
+            "scaler_mean": self._mu,
+            "scaler_inv_scale": self._inv_scale,
             "ensemble_weights": self.ensemble_weights,
             "is_trained": self.is_trained,
             "saved_at": datetime.now().isoformat(),
         }
 
-        with open(filepath, "wb") as f:
-            pickle.dump(model_data, f)
+        import joblib
+
+        # Uncompressed so that numpy arrays can be memory-mapped on load
+        _write_atomically(filepath, lambda path: joblib.dump(model_data, path, protocol=5))
 
         logger.info(f"Model saved to {filepath}")
 
@@ -337,18 +610,58 @@ class SectorRotationModel:
         if not filepath.exists():
             raise FileNotFoundError(f"Model file not found: {filepath}")
 
-        with open(filepath, "rb") as f:
-            model_data = pickle.load(f)
+        # Reuse the copy (and scores) another instance already read, unless the file was re-saved
+        key = str(filepath.resolve())
+        mtime = filepath.stat().st_mtime_ns
+        cached = SectorRotationModel._cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            _, model_data, score_cache = cached
+        else:
+            model_data = self._read_model_file(filepath)
+            score_cache = OrderedDict()
+            SectorRotationModel._cache[key] = (mtime, model_data, score_cache)
 
-        self.models = model_data["models"]
-        self.scaler = model_data["scaler"]
+        # Shallow copies so that retraining this instance leaves the cached models intact
+        self.models = dict(model_data["models"])
+        self.scaler = copy.copy(model_data["scaler"])
         self.feature_names = model_data["feature_names"]
+        self._feature_name_to_idx = {name: i for i, name in enumerate(self.feature_names)}
         self.feature_importance = model_data.get("feature_importance", {})
+        self._feature_medians = model_data.get("feature_medians")
+        self._mu = model_data.get("scaler_mean")
+        self._inv_scale = model_data.get("scaler_inv_scale")
+        if self._mu is None and hasattr(self.scaler, "mean_"):
+            self._freeze_scaler()
         self.ensemble_weights = model_data.get("ensemble_weights", self.ensemble_weights)
         self.is_trained = model_data["is_trained"]
+        self._score_cache = score_cache
+        self._set_booster(self.models.get("gradient_boosting"))
+        self._set_ridge(self.models.get("ridge"))
+        self._fil = None
 
         logger.info(f"Model loaded from {filepath}")
 
+    def _read_model_file(self, filepath: Path) -> Dict[str, Any]:
+        """Deserialize a saved model file, including its native-format XGBoost model"""
+        import joblib
+
+        model_data = joblib.load(filepath, mmap_mode="r")
+
+        models = model_data["models"]
+        xgb_file = model_data.get("xgb_model_file")
+        if xgb_file:
+            if XGBOOST_AVAILABLE:
+                from xgboost import XGBRegressor
+
+                gb_model = XGBRegressor()
+                gb_model.load_model(str(self.models_dir / xgb_file))
+                models["gradient_boosting"] = gb_model
+            else:
+                logger.warning("XGBoost not installed, skipping gradient boosting model")
+                models.pop("gradient_boosting", None)
+
+        return model_data
+
     def get_feature_importance(self, top_n: int = 20) -> Dict[str, List[Tuple[str, float]]]:
         """
         Get feature importance from trained models
@@ -391,8 +704,15 @@ def train_model_from_data(
     Returns:
         Training metrics
     """
-    features_df = pd.read_csv(features_path)
-    targets_df = pd.read_csv(targets_path)
+    # pyarrow parses on multiple threads; fall back to the C parser without it
+    engine = "pyarrow" if PYARROW_AVAILABLE else "c"
+    features_df = pd.read_csv(features_path, engine=engine)
+    targets_df = pd.read_csv(
+        targets_path,
+        engine=engine,
+        usecols=["date", "symbol", "relative_return"],
+        dtype={"relative_return": np.float32},
+    )
 
     model = SectorRotationModel(models_dir=Path(output_dir))
     metrics = model.train(features_df, targets_df)
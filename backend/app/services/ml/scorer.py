@@ -9,13 +9,12 @@ from typing import Optional, Dict, List, Tuple
 import logging
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, Date
 
 from app.database import SessionLocal
 from app.models.scores import SectorScore, BusinessCycle
 from app.services.ml.model import SectorRotationModel
 from app.services.data_processing.feature_processor import FeatureProcessor
-from app.services.data_processing.indicators import TechnicalIndicators
 from app.services.data_collection.yahoo_collector import YahooCollector
 from app.services.data_collection.fred_collector import FREDCollector
 from app.core.constants import (
@@ -28,6 +27,11 @@ from app.core.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Centered x-axis for the default 3-point trend fit; slope = x @ y / sum(x^2)
+_TREND_PERIODS = 3
+_TREND_X = np.arange(_TREND_PERIODS) - (_TREND_PERIODS - 1) / 2
+_TREND_X_VAR = float(_TREND_X @ _TREND_X)
+
 
 class BusinessCycleDetector:
     """
@@ -46,10 +50,16 @@ class BusinessCycleDetector:
     def detect_phase(
         self,
         db: Optional[Session] = None,
+        series_cache: Optional[Dict[str, pd.Series]] = None,
     ) -> Tuple[str, float]:
         """
         Detect current business cycle phase
 
+        Args:
+            db: Database session
+            series_cache: Full macro series by ID already loaded by the feature
+                processor; only series missing from it are queried
+
         Returns:
             Tuple of (phase_name, confidence_score)
         """
@@ -71,18 +81,46 @@ class BusinessCycleDetector:
                 "consumer_sentiment": "UMCSENT",
             }
 
+            # Reuse cached series; for the rest only the latest points needed for
+            # trends are fetched, with each series' full-history std from SQL
+            series_values = {}
+            series_std = {}
+            if series_cache:
+                series_values = {
+                    series_id: series_cache[series_id].to_numpy(dtype=np.float64)
+                    for series_id in key_series.values()
+                    if series_id in series_cache and len(series_cache[series_id]) > 0
+                }
+            missing = [sid for sid in key_series.values() if sid not in (series_cache or {})]
+            if missing:
+                series_values.update(self.fred_collector.get_series_bulk(
+                    missing, db=db, limit=_TREND_PERIODS + 1
+                ))
+                series_std = self.fred_collector.get_series_std(missing, db=db)
+            trend_std = {}
             for name, series_id in key_series.items():
-                data = self.fred_collector.get_series_data(series_id, db=db)
-                if not data.empty:
-                    indicators[name] = data
+                if series_id in series_values:
+                    indicators[name] = series_values[series_id]
+                    trend_std[name] = series_std.get(series_id)
+
+            # Trend of each scored indicator over its latest points
+            trends = {}
+            for name, periods in (
+                ("unemployment", _TREND_PERIODS),
+                ("leading_index", _TREND_PERIODS),
+                ("industrial_production", _TREND_PERIODS),
+            ):
+                if name in indicators and len(indicators[name]) > 0:
+                    trends[name] = self._calculate_trend(
+                        indicators[name], periods, std=trend_std[name]
+                    )
 
             # Score each phase
             phase_scores = {phase: 0 for phase in BUSINESS_CYCLE_PHASES}
 
             # Yield Curve analysis
             if "yield_curve" in indicators and len(indicators["yield_curve"]) > 0:
-                yc_value = indicators["yield_curve"]["value"].iloc[-1]
-                yc_trend = self._calculate_trend(indicators["yield_curve"]["value"])
+                yc_value = indicators["yield_curve"][-1]
 
                 if yc_value < 0:  # Inverted
                     phase_scores["recession"] += 2
@@ -96,8 +134,7 @@ class BusinessCycleDetector:
 
             # Unemployment analysis
             if "unemployment" in indicators and len(indicators["unemployment"]) > 0:
-                unemp_value = indicators["unemployment"]["value"].iloc[-1]
-                unemp_trend = self._calculate_trend(indicators["unemployment"]["value"])
+                unemp_trend = trends["unemployment"]
 
                 if unemp_trend == "rising":
                     phase_scores["recession"] += 2
@@ -110,7 +147,7 @@ class BusinessCycleDetector:
 
             # Leading Index analysis
             if "leading_index" in indicators and len(indicators["leading_index"]) > 0:
-                lead_trend = self._calculate_trend(indicators["leading_index"]["value"])
+                lead_trend = trends["leading_index"]
 
                 if lead_trend == "rising":
                     phase_scores["early_cycle"] += 1.5
@@ -121,7 +158,7 @@ class BusinessCycleDetector:
 
             # Industrial Production analysis
             if "industrial_production" in indicators and len(indicators["industrial_production"]) > 0:
-                ip_trend = self._calculate_trend(indicators["industrial_production"]["value"])
+                ip_trend = trends["industrial_production"]
 
                 if ip_trend == "rising":
                     phase_scores["mid_cycle"] += 1.5
@@ -132,8 +169,7 @@ class BusinessCycleDetector:
 
             # Credit Spread analysis
             if "credit_spread" in indicators and len(indicators["credit_spread"]) > 0:
-                spread_value = indicators["credit_spread"]["value"].iloc[-1]
-                spread_trend = self._calculate_trend(indicators["credit_spread"]["value"])
+                spread_value = indicators["credit_spread"][-1]
 
                 if spread_value > 3:  # High spreads
                     phase_scores["recession"] += 2
@@ -159,15 +195,38 @@ class BusinessCycleDetector:
             if close_session:
                 db.close()
 
-    def _calculate_trend(self, series: pd.Series, periods: int = 3) -> str:
-        """Calculate trend direction from series"""
-        if len(series) < periods + 1:
-            return "stable"
+    def _calculate_trend(
+        self,
+        values: np.ndarray,
+        periods: int = 3,
+        std: Optional[float] = None,
+    ) -> str:
+        """
+        Calculate trend direction from a series' values in date order
 
-        recent = series.iloc[-periods:]
-        slope = np.polyfit(range(len(recent)), recent, 1)[0]
+        Args:
+            values: Series values, at least the latest `periods + 1`
+            periods: Number of latest points the slope is fitted to
+            std: Standard deviation of the full series, if values is only its tail
+        """
+        if len(values) < periods + 1:
+            return "stable"
 
-        threshold = series.std() * 0.05
+        # Closed-form least-squares slope over the last `periods` points
+        if periods == _TREND_PERIODS:
+            x, x_var = _TREND_X, _TREND_X_VAR
+        else:
+            x = np.arange(periods) - (periods - 1) / 2
+            x_var = float(x @ x)
+        recent = values[-periods:]
+        slope = (x @ recent) / x_var
+
+        # Plain std is several times cheaper than nanstd; fall back only when NaNs are present
+        if std is None:
+            std = values.std(ddof=1)
+            if np.isnan(std):
+                std = np.nanstd(values, ddof=1)
+        threshold = std * 0.05
         if slope > threshold:
             return "rising"
         elif slope < -threshold:
@@ -192,16 +251,24 @@ class BusinessCycleDetector:
             target_date = date.today()
 
         try:
+            # Upsert in place rather than delete + insert
             stmt = text("""
-                INSERT OR REPLACE INTO business_cycle (date, phase, confidence, created_at)
+                INSERT INTO business_cycle (date, phase, confidence, created_at)
                 VALUES (:date, :phase, :confidence, CURRENT_TIMESTAMP)
+                ON CONFLICT(date) DO UPDATE SET
+                    phase = excluded.phase,
+                    confidence = excluded.confidence,
+                    created_at = excluded.created_at
             """)
             db.execute(stmt, {
                 "date": target_date,
                 "phase": phase,
                 "confidence": confidence,
             })
-            db.commit()
+
+            # An injected session belongs to the caller's transaction
+            if close_session:
+                db.commit()
 
         finally:
             if close_session:
@@ -224,6 +291,16 @@ class SectorScorer:
         self.cycle_detector = BusinessCycleDetector()
         self.yahoo_collector = YahooCollector()
 
+        # Sector x factor sensitivity matrix for macro sensitivity scoring
+        self._sector_order = list(SECTOR_MACRO_SENSITIVITY)
+        self._factor_order = sorted(
+            {factor for sens in SECTOR_MACRO_SENSITIVITY.values() for factor in sens}
+        )
+        self._S = np.array([
+            [SECTOR_MACRO_SENSITIVITY[symbol].get(factor, 0.0) for factor in self._factor_order]
+            for symbol in self._sector_order
+        ])
+
         self.ml_model = SectorRotationModel()
         if model_path:
             try:
@@ -251,16 +328,16 @@ class SectorScorer:
             )
 
             # Normalize to 0-100 scale
-            values = list(raw_scores.values())
-            min_val, max_val = min(values), max(values)
-            range_val = max_val - min_val if max_val != min_val else 1
+            symbols = list(raw_scores)
+            values = np.fromiter(
+                (raw_scores[s] for s in symbols), dtype=np.float64, count=len(symbols)
+            )
+            min_val, max_val = values.min(), values.max()
+            range_val = max_val - min_val if max_val != min_val else 1.0
 
-            normalized = {
-                symbol: ((score - min_val) / range_val * 80 + 10)  # 10-90 range
-                for symbol, score in raw_scores.items()
-            }
+            normalized = (values - min_val) / range_val * 80 + 10  # 10-90 range
 
-            return normalized
+            return dict(zip(symbols, normalized.tolist()))
 
         except Exception as e:
             logger.error(f"Error calculating ML scores: {str(e)}")
@@ -305,51 +382,57 @@ class SectorScorer:
             close_session = True
 
         try:
-            scores = {}
-
-            for symbol in SECTOR_ETFS.keys():
-                df = self.yahoo_collector.get_etf_data(symbol, db=db)
-
-                if df.empty or len(df) < 50:
-                    scores[symbol] = 50.0
-                    continue
+            symbols = list(SECTOR_ETFS.keys())
+            lookback = 250
 
-                # Calculate momentum indicators
-                price = df["adj_close"]
+            # One query for all sectors; 250 bars cover every lookback used below
+            etf_data = self.yahoo_collector.get_all_etf_data(
+                symbols, lookback_days=lookback, db=db
+            )
 
-                # RSI
-                rsi = TechnicalIndicators.rsi(price).iloc[-1]
+            # Right-align prices so row -k holds each sector's k-th latest bar
+            prices = np.full((lookback, len(symbols)), np.nan)
+            counts = np.zeros(len(symbols), dtype=int)
+            for j, symbol in enumerate(symbols):
+                df = etf_data.get(symbol)
+                if df is not None and len(df) > 0:
+                    closes = df["adj_close"].to_numpy(dtype=float)[-lookback:]
+                    prices[-len(closes):, j] = closes
+                    counts[j] = len(closes)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # RSI from the simple averages of the last 14 gains and losses
+                delta = np.diff(prices[-15:], axis=0)
+                avg_gain = np.fmax(delta, 0.0).mean(axis=0)
+                avg_loss = np.fmax(-delta, 0.0).mean(axis=0)
+                rsi = np.where(avg_loss != 0, 100 - 100 / (1 + avg_gain / avg_loss), 50.0)
 
                 # Price vs 50-day MA
-                sma_50 = TechnicalIndicators.sma(price, 50).iloc[-1]
-                price_vs_ma = (price.iloc[-1] / sma_50 - 1) * 100 if sma_50 else 0
+                sma_50 = prices[-50:].mean(axis=0)
+                price_vs_ma = np.where(sma_50 != 0, (prices[-1] / sma_50 - 1) * 100, 0.0)
 
                 # 3-month return
-                if len(price) > 63:
-                    return_3m = (price.iloc[-1] / price.iloc[-63] - 1) * 100
-                else:
-                    return_3m = 0
+                return_3m = np.where(counts > 63, (prices[-1] / prices[-63] - 1) * 100, 0.0)
 
-                # Combine into score
-                # RSI: 30-70 is neutral, outside is overbought/oversold
-                rsi_score = 50 + (rsi - 50) * 0.5  # Dampen RSI impact
+            # Combine into score
+            # RSI: 30-70 is neutral, outside is overbought/oversold
+            rsi_score = 50 + (rsi - 50) * 0.5  # Dampen RSI impact
 
-                # Price vs MA: Positive is bullish
-                ma_score = 50 + min(max(price_vs_ma * 5, -30), 30)
+            # Price vs MA: Positive is bullish
+            ma_score = 50 + np.clip(price_vs_ma * 5, -30, 30)
 
-                # Return momentum
-                return_score = 50 + min(max(return_3m * 2, -40), 40)
+            # Return momentum
+            return_score = 50 + np.clip(return_3m * 2, -40, 40)
 
-                # Weighted average
-                momentum_score = (
-                    rsi_score * 0.3 +
-                    ma_score * 0.35 +
-                    return_score * 0.35
-                )
+            # Weighted average
+            momentum_score = np.clip(
+                rsi_score * 0.3 + ma_score * 0.35 + return_score * 0.35, 0, 100
+            )
 
-                scores[symbol] = min(max(momentum_score, 0), 100)
+            # Not enough history: neutral score
+            momentum_score = np.where(counts >= 50, momentum_score, 50.0)
 
-            return scores
+            return dict(zip(symbols, momentum_score.tolist()))
 
         finally:
             if close_session:
@@ -365,8 +448,6 @@ class SectorScorer:
         Returns:
             Dict mapping sector symbol to macro sensitivity score (0-100)
         """
-        scores = {}
-
         # Map macro features to sensitivity categories
         macro_conditions = {}
 
@@ -410,28 +491,30 @@ class SectorScorer:
             ip_change = macro_features.get("INDPRO_roc_3m", 0) or 0
             macro_conditions["industrial_production"] = min(max(ip_change / 3, -1), 1)
 
-        # Calculate score for each sector
-        for symbol, sensitivities in SECTOR_MACRO_SENSITIVITY.items():
-            score = 50  # Base score
-
-            for factor, sensitivity in sensitivities.items():
-                if factor in macro_conditions:
-                    # Positive sensitivity + positive condition = positive impact
-                    impact = sensitivity * macro_conditions[factor] * 25
-                    score += impact
+        # Positive sensitivity + positive condition = positive impact;
+        # factors without a condition contribute nothing
+        c = np.array([macro_conditions.get(factor, 0.0) for factor in self._factor_order])
+        raw = 50 + 25 * (self._S @ c)
 
-            scores[symbol] = min(max(score, 0), 100)
-
-        return scores
+        return dict(zip(self._sector_order, np.clip(raw, 0, 100).tolist()))
 
     def calculate_composite_scores(
         self,
         target_date: Optional[date] = None,
         db: Optional[Session] = None,
+        cycle: Optional[Tuple[str, float]] = None,
+        use_saved_macro: bool = False,
     ) -> Dict[str, Dict[str, float]]:
         """
         Calculate composite scores for all sectors
 
+        Args:
+            target_date: Date to calculate scores for
+            db: Database session
+            cycle: (phase, confidence) already detected by the caller
+            use_saved_macro: Reuse the macro features saved for target_date
+                by the daily feature run (see FeatureProcessor)
+
         Returns:
             Dict mapping sector symbol to score breakdown
         """
@@ -441,13 +524,18 @@ class SectorScorer:
             close_session = True
 
         try:
+            # Macro series loaded for features are reused by cycle detection
+            series_cache: Dict[str, pd.Series] = {}
+
             # Get features
             macro_features, sector_features = self.feature_processor.get_all_features_for_date(
-                target_date, db
+                target_date, db, series_cache, use_saved_macro=use_saved_macro
             )
 
             # Detect business cycle
-            phase, confidence = self.cycle_detector.detect_phase(db)
+            if cycle is None:
+                cycle = self.cycle_detector.detect_phase(db, series_cache)
+            phase, confidence = cycle
 
             # Calculate component scores
             ml_scores = self.calculate_ml_scores(macro_features, sector_features)
@@ -455,38 +543,37 @@ class SectorScorer:
             momentum_scores = self.calculate_momentum_scores(db)
             macro_sens_scores = self.calculate_macro_sensitivity_scores(macro_features)
 
-            # Combine scores
-            results = {}
-
-            for symbol in SECTOR_ETFS.keys():
-                ml = ml_scores.get(symbol, 50)
-                cycle = cycle_scores.get(symbol, 50)
-                momentum = momentum_scores.get(symbol, 50)
-                macro_sens = macro_sens_scores.get(symbol, 50)
-
-                composite = (
-                    SCORE_WEIGHTS["ml_score"] * ml +
-                    SCORE_WEIGHTS["cycle_score"] * cycle +
-                    SCORE_WEIGHTS["momentum_score"] * momentum +
-                    SCORE_WEIGHTS["macro_sensitivity_score"] * macro_sens
-                )
+            # Combine scores across sectors in one vectorized pass
+            symbols = list(SECTOR_ETFS.keys())
+            ml = np.array([ml_scores.get(s, 50) for s in symbols], dtype=np.float64)
+            cycle_vec = np.array([cycle_scores.get(s, 50) for s in symbols], dtype=np.float64)
+            momentum = np.array([momentum_scores.get(s, 50) for s in symbols], dtype=np.float64)
+            macro_sens = np.array([macro_sens_scores.get(s, 50) for s in symbols], dtype=np.float64)
+
+            composite = (
+                SCORE_WEIGHTS["ml_score"] * ml +
+                SCORE_WEIGHTS["cycle_score"] * cycle_vec +
+                SCORE_WEIGHTS["momentum_score"] * momentum +
+                SCORE_WEIGHTS["macro_sensitivity_score"] * macro_sens
+            )
 
+            results = {}
+            for i, symbol in enumerate(symbols):
                 results[symbol] = {
-                    "composite_score": round(composite, 2),
-                    "ml_score": round(ml, 2),
-                    "cycle_score": round(cycle, 2),
-                    "momentum_score": round(momentum, 2),
-                    "macro_sensitivity_score": round(macro_sens, 2),
+                    "composite_score": round(float(composite[i]), 2),
+                    "ml_score": round(float(ml[i]), 2),
+                    "cycle_score": round(float(cycle_vec[i]), 2),
+                    "momentum_score": round(float(momentum[i]), 2),
+                    "macro_sensitivity_score": round(float(macro_sens[i]), 2),
                 }
 
-            # Add ranks
-            sorted_sectors = sorted(
-                results.items(),
-                key=lambda x: x[1]["composite_score"],
-                reverse=True,
-            )
+            # Add ranks (by rounded score; ties keep sector order)
+            rounded = np.array([results[s]["composite_score"] for s in symbols])
+            order = np.argsort(-rounded, kind="stable")
+            ranks = np.empty_like(order)
+            ranks[order] = np.arange(1, len(order) + 1)
 
-            for rank, (symbol, _) in enumerate(sorted_sectors, 1):
+            for symbol, rank in zip(symbols, ranks.tolist()):
                 results[symbol]["rank"] = rank
 
             return results
@@ -511,15 +598,24 @@ class SectorScorer:
             target_date = date.today()
 
         try:
-            for symbol, score_data in scores.items():
-                stmt = text("""
-                    INSERT OR REPLACE INTO sector_scores
-                    (date, symbol, composite_score, ml_score, cycle_score,
-                     momentum_score, macro_sensitivity_score, rank, created_at)
-                    VALUES (:date, :symbol, :composite_score, :ml_score, :cycle_score,
-                            :momentum_score, :macro_sensitivity_score, :rank, CURRENT_TIMESTAMP)
-                """)
-                db.execute(stmt, {
+            # Upsert on the (date, symbol) unique index rather than delete + insert
+            stmt = text("""
+                INSERT INTO sector_scores
+                (date, symbol, composite_score, ml_score, cycle_score,
+                 momentum_score, macro_sensitivity_score, rank, created_at)
+                VALUES (:date, :symbol, :composite_score, :ml_score, :cycle_score,
+                        :momentum_score, :macro_sensitivity_score, :rank, CURRENT_TIMESTAMP)
+                ON CONFLICT(date, symbol) DO UPDATE SET
+                    composite_score = excluded.composite_score,
+                    ml_score = excluded.ml_score,
+                    cycle_score = excluded.cycle_score,
+                    momentum_score = excluded.momentum_score,
+                    macro_sensitivity_score = excluded.macro_sensitivity_score,
+                    rank = excluded.rank,
+                    created_at = excluded.created_at
+            """)
+            rows = [
+                {
                     "date": target_date,
                     "symbol": symbol,
                     "composite_score": score_data["composite_score"],
@@ -528,44 +624,74 @@ class SectorScorer:
                     "momentum_score": score_data["momentum_score"],
                     "macro_sensitivity_score": score_data["macro_sensitivity_score"],
                     "rank": score_data["rank"],
-                })
+                }
+                for symbol, score_data in scores.items()
+            ]
+
+            # Single executemany for all sectors
+            if rows:
+                db.execute(stmt, rows)
 
-            db.commit()
+            # An injected session belongs to the caller's transaction
+            if close_session:
+                db.commit()
             logger.info(f"Saved scores for {len(scores)} sectors on {target_date}")
 
         finally:
             if close_session:
                 db.close()
 
-    def update_daily_scores(self, target_date: Optional[date] = None):
+    def update_daily_scores(
+        self,
+        target_date: Optional[date] = None,
+        db: Optional[Session] = None,
+        cycle: Optional[Tuple[str, float]] = None,
+        use_saved_macro: bool = False,
+    ):
         """
         Update scores for a specific date (or today)
 
         Args:
             target_date: Date to update scores for
+            db: Database session shared by every step of the update; when
+                given, the caller commits
+            cycle: (phase, confidence) already detected and saved by the
+                caller; detected and saved here when omitted
+            use_saved_macro: Reuse the macro features saved for target_date
+                by the daily feature run
         """
         if target_date is None:
             target_date = date.today()
 
         logger.info(f"Updating scores for {target_date}...")
 
-        db = SessionLocal()
+        close_session = False
+        if db is None:
+            db = SessionLocal()
+            close_session = True
 
         try:
             # Detect and save business cycle
-            phase, confidence = self.cycle_detector.detect_phase(db)
-            self.cycle_detector.save_phase(phase, confidence, target_date, db)
+            if cycle is None:
+                cycle = self.cycle_detector.detect_phase(db)
+                self.cycle_detector.save_phase(*cycle, target_date, db)
 
             # Calculate and save scores
-            scores = self.calculate_composite_scores(target_date, db)
+            scores = self.calculate_composite_scores(
+                target_date, db, cycle, use_saved_macro=use_saved_macro
+            )
             self.save_scores(scores, target_date, db)
 
+            if close_session:
+                db.commit()
+
             logger.info(f"Score update complete for {target_date}")
 
             return scores
 
         finally:
-            db.close()
+            if close_session:
+                db.close()
 
     def get_current_rankings(
         self,
@@ -583,31 +709,28 @@ class SectorScorer:
             close_session = True
 
         try:
-            # Get latest scores
-            latest_date = db.query(SectorScore.date).order_by(
-                SectorScore.date.desc()
-            ).first()
-
-            if not latest_date:
-                return []
-
-            scores = db.query(SectorScore).filter(
-                SectorScore.date == latest_date[0]
-            ).order_by(SectorScore.rank).all()
+            # Latest scores in one statement, as plain mappings (no ORM objects)
+            stmt = text("""
+                SELECT rank, symbol, composite_score, ml_score, cycle_score,
+                       momentum_score, macro_sensitivity_score, date
+                FROM sector_scores
+                WHERE date = (SELECT MAX(date) FROM sector_scores)
+                ORDER BY rank
+            """).columns(date=Date)
 
             return [
                 {
-                    "rank": s.rank,
-                    "symbol": s.symbol,
-                    "name": SECTOR_ETFS.get(s.symbol, {}).get("name", s.symbol),
-                    "composite_score": s.composite_score,
-                    "ml_score": s.ml_score,
-                    "cycle_score": s.cycle_score,
-                    "momentum_score": s.momentum_score,
-                    "macro_sensitivity_score": s.macro_sensitivity_score,
-                    "date": s.date,
+                    "rank": row["rank"],
+                    "symbol": row["symbol"],
+                    "name": SECTOR_ETFS.get(row["symbol"], {}).get("name", row["symbol"]),
+                    "composite_score": row["composite_score"],
+                    "ml_score": row["ml_score"],
+                    "cycle_score": row["cycle_score"],
+                    "momentum_score": row["momentum_score"],
+                    "macro_sensitivity_score": row["macro_sensitivity_score"],
+                    "date": row["date"],
                 }
-                for s in scores
+                for row in db.execute(stmt).mappings().all()
             ]
 
         finally:
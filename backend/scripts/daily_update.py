@@ -9,6 +9,7 @@ Usage:
 import sys
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -51,55 +52,64 @@ def main():
         from app.database import init_db
         init_db()
 
-        # 1. Collect FRED data
-        logger.info("\n[1/5] Collecting FRED macro data...")
         from app.services.data_collection.fred_collector import FREDCollector
-
-        fred = FREDCollector()
-        if fred.fred:
-            fred_results = fred.update_all_series()
-            logger.info(f"FRED data updated: {sum(fred_results.values())} records")
-        else:
-            logger.warning("FRED API not configured. Skipping FRED data collection.")
-            logger.warning("Set FRED_API_KEY environment variable to enable.")
-
-        # 2. Collect Yahoo Finance data
-        logger.info("\n[2/5] Collecting sector ETF data from Yahoo Finance...")
         from app.services.data_collection.yahoo_collector import YahooCollector
 
+        fred = FREDCollector()
         yahoo = YahooCollector()
-        yahoo_results = yahoo.update_all_etfs()
-        logger.info(f"Yahoo Finance data updated: {sum(yahoo_results.values())} records")
+
+        # 1-2. Collect FRED and Yahoo Finance data concurrently; both are
+        # network-bound and each collector opens its own session
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            logger.info("\n[1/5] Collecting FRED macro data...")
+            fred_future = executor.submit(fred.update_all_series) if fred.fred else None
+            if fred_future is None:
+                logger.warning("FRED API not configured. Skipping FRED data collection.")
+                logger.warning("Set FRED_API_KEY environment variable to enable.")
+
+            logger.info("\n[2/5] Collecting sector ETF data from Yahoo Finance...")
+            yahoo_future = executor.submit(yahoo.update_all_etfs)
+
+            if fred_future is not None:
+                fred_results = fred_future.result()
+                logger.info(f"FRED data updated: {sum(fred_results.values())} records")
+
+            yahoo_results = yahoo_future.result()
+            logger.info(f"Yahoo Finance data updated: {sum(yahoo_results.values())} records")
+
+        # One scorer (and its model, feature processor and cycle detector)
+        # serves every remaining step
+        from app.services.ml.scorer import SectorScorer
+        from app.database import SessionLocal, scoped_transaction
+
+        scorer = SectorScorer()
 
         # 3. Process features
         logger.info("\n[3/5] Processing features...")
-        from app.services.data_processing.feature_processor import FeatureProcessor
-
-        processor = FeatureProcessor()
-        processor.process_daily_features()
+        scorer.feature_processor.process_daily_features()
         logger.info("Features processed successfully")
 
         # 4. Update business cycle
         logger.info("\n[4/5] Detecting business cycle phase...")
-        from app.services.ml.scorer import BusinessCycleDetector
-        from app.database import SessionLocal
 
-        detector = BusinessCycleDetector()
+        # One session and one transaction for the cycle detection and scoring steps
         db = SessionLocal()
         try:
-            phase, confidence = detector.detect_phase(db)
-            detector.save_phase(phase, confidence, db=db)
-            logger.info(f"Business cycle: {phase} (confidence: {confidence:.1%})")
+            with scoped_transaction(db):
+                detector = scorer.cycle_detector
+                phase, confidence = detector.detect_phase(db)
+                detector.save_phase(phase, confidence, db=db)
+                logger.info(f"Business cycle: {phase} (confidence: {confidence:.1%})")
+
+                # 5. Update sector scores (reusing the detected phase)
+                logger.info("\n[5/5] Calculating sector scores...")
+                # Macro features were just saved by step 3
+                scores = scorer.update_daily_scores(
+                    db=db, cycle=(phase, confidence), use_saved_macro=True
+                )
         finally:
             db.close()
 
-        # 5. Update sector scores
-        logger.info("\n[5/5] Calculating sector scores...")
-        from app.services.ml.scorer import SectorScorer
-
-        scorer = SectorScorer()
-        scores = scorer.update_daily_scores()
-
         # Log top sectors
         sorted_scores = sorted(
             scores.items(),
@@ -0,0 +1,28 @@
+"""
+Shared test fixtures
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import Base
+from app import models  # noqa: F401  (registers the tables)
+
+
+@pytest.fixture
+def session_factory():
+    """Sessions on a fresh in-memory database shared by all connections"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
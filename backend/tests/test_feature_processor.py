@@ -0,0 +1,64 @@
+"""
+Tests for FeatureProcessor
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.models import MacroData
+from app.services.data_processing import feature_processor
+from app.services.data_processing.feature_processor import FeatureProcessor
+
+
+def _seed_macro_data(db):
+    """Quarterly GDP plus a monthly and a daily series from 2004"""
+    rng = np.random.default_rng(0)
+    dates_by_series = {
+        "GDPC1": pd.date_range("2004-01-01", "2024-04-01", freq="QS").date,
+        "UNRATE": pd.date_range("2004-01-01", "2024-05-01", freq="MS").date,
+        "T10Y2Y": pd.bdate_range("2004-01-01", "2024-05-15").date,
+    }
+    for series_id, dates in dates_by_series.items():
+        values = 2 + np.cumsum(rng.normal(size=len(dates))) * 0.1
+        db.add_all([
+            MacroData(series_id=series_id, date=d, value=float(v))
+            for d, v in zip(dates, values)
+        ])
+    db.commit()
+
+
+def test_saved_macro_features_hit_after_process_daily_features(session_factory, monkeypatch):
+    monkeypatch.setattr(feature_processor, "SessionLocal", session_factory)
+    target_date = date(2024, 5, 15)
+
+    db = session_factory()
+    try:
+        _seed_macro_data(db)
+        processor = FeatureProcessor()
+        assert processor.get_saved_macro_features(target_date, db) == {}
+
+        processor.process_daily_features(target_date)
+        computed = processor.get_macro_features(target_date, db)
+        saved = processor.get_saved_macro_features(target_date, db)
+
+        # Quarterly GDP has no 6m/12m ROC, so those are NaN and not saved
+        assert computed["GDPC1_roc_6m"] is None
+        assert set(saved) == set(computed)
+        for name, value in computed.items():
+            if value is None or np.isnan(value):
+                assert saved[name] is None
+            else:
+                assert np.isclose(saved[name], value)
+
+        # The saved path is used instead of recomputing
+        def fail(*args, **kwargs):
+            raise AssertionError("macro features recomputed")
+
+        monkeypatch.setattr(processor, "get_macro_features", fail)
+        macro_features, _ = processor.get_all_features_for_date(
+            target_date, db, use_saved_macro=True
+        )
+        assert macro_features == saved
+    finally:
+        db.close()